@@ -42,4 +42,698 @@ Compare how each AI model:
 - Documents the code
 - Optimizes performance
 - Provides testing strategies
-""" 
\ No newline at end of file
+""" 
+
+import bisect
+import heapq
+import multiprocessing
+import os
+import pickle
+import random
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from collections import deque
+from contextlib import ExitStack, contextmanager, nullcontext
+from functools import cmp_to_key
+from itertools import accumulate, count
+from multiprocessing import shared_memory
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; shared buffers are then sorted through array.array
+    np = None
+
+Comparator = Callable[[Any, Any], int]
+
+
+def _sort_key(comparator: Optional[Comparator]) -> Optional[Callable[[Any], Any]]:
+    """Turns a cmp-style comparator (negative, zero, positive) into a sort key"""
+    return None if comparator is None else cmp_to_key(comparator)
+
+
+# External merge sort
+# Runs are written as a sequence of blocks. Each block is a 5-byte header (type tag,
+# record count) and a payload: packed int64/float64 for 'q'/'d', uint32 lengths plus
+# one concatenated blob for 's' (UTF-8) and 'b' (bytes), and a pickled list for 'p'
+# (mixed types, bools, ints beyond 64 bits, tuples, ...). Uniform blocks decode in C.
+BLOCK_RECORDS = 8192
+_BLOCK_HEADER = struct.Struct('<cI')
+_BLOB_SIZE = struct.Struct('<Q')
+_INT64 = (-(1 << 63), 1 << 63)
+
+
+def _block_tag(records: List[Any]) -> bytes:
+    kind = type(records[0])
+    if kind not in (int, float, str, bytes) or any(type(record) is not kind for record in records):
+        return b'p'
+    if kind is int and not (_INT64[0] <= min(records) and max(records) < _INT64[1]):
+        return b'p'
+    return {int: b'q', float: b'd', str: b's', bytes: b'b'}[kind]
+
+
+def _write_block(f: BinaryIO, records: List[Any]) -> None:
+    tag = _block_tag(records)
+    f.write(_BLOCK_HEADER.pack(tag, len(records)))
+    if tag in (b'q', b'd'):
+        f.write(array(tag.decode(), records).tobytes())
+        return
+    if tag == b'p':
+        blob = pickle.dumps(records, pickle.HIGHEST_PROTOCOL)
+    else:
+        # Strings store character lengths so the decoded blob can be sliced directly
+        blob = ''.join(records).encode() if tag == b's' else b''.join(records)
+        f.write(array('I', map(len, records)).tobytes())
+    f.write(_BLOB_SIZE.pack(len(blob)))
+    f.write(blob)
+
+
+def _read_blocks(f: BinaryIO) -> Iterator[List[Any]]:
+    while True:
+        header = f.read(_BLOCK_HEADER.size)
+        if not header:
+            return
+        tag, count = _BLOCK_HEADER.unpack(header)
+        if tag in (b'q', b'd'):
+            records = array(tag.decode())
+            records.frombytes(f.read(8 * count))
+            yield records.tolist()
+            continue
+        if tag != b'p':
+            lengths = array('I')
+            lengths.frombytes(f.read(4 * count))
+        (size,) = _BLOB_SIZE.unpack(f.read(_BLOB_SIZE.size))
+        blob = f.read(size)
+        if tag == b'p':
+            yield pickle.loads(blob)
+            continue
+        if tag == b's':
+            blob = blob.decode()
+        ends = list(accumulate(lengths))
+        yield [blob[end - length:end] for end, length in zip(ends, lengths)]
+
+
+def write_run(path: str, records: Iterable[Any]) -> int:
+    """Writes records to path in the run format; returns the file size in bytes"""
+    with open(path, 'wb') as f:
+        block = []
+        for record in records:
+            block.append(record)
+            if len(block) == BLOCK_RECORDS:
+                _write_block(f, block)
+                block = []
+        if block:
+            _write_block(f, block)
+        return f.tell()
+
+
+def read_run(path: str) -> Iterator[Any]:
+    """Streams the records of a run file, one block in memory at a time"""
+    with open(path, 'rb', buffering=1 << 20) as f:
+        for block in _read_blocks(f):
+            yield from block
+
+
+def _sort_run(task: Tuple[str, List[Any], Optional[Comparator], bool]) -> Tuple[str, int]:
+    path, records, comparator, descending = task
+    records.sort(key=_sort_key(comparator), reverse=descending)
+    return path, write_run(path, records)
+
+
+def _merge_runs(task: Tuple[str, List[str], Optional[Comparator], bool]) -> Tuple[str, int]:
+    path, paths, comparator, descending = task
+    merged = heapq.merge(*map(read_run, paths), key=_sort_key(comparator), reverse=descending)
+    size = write_run(path, merged)
+    for run in paths:
+        os.remove(run)
+    return path, size
+
+
+def _chunk_by_memory(records: Iterable[Any], budget: int) -> Iterator[List[Any]]:
+    # Record cost is estimated as the object size plus its list slot
+    chunk, used = [], 0
+    for record in records:
+        chunk.append(record)
+        used += sys.getsizeof(record) + 8
+        if used >= budget:
+            yield chunk
+            chunk, used = [], 0
+    if chunk:
+        yield chunk
+
+
+class ExternalSortStats:
+    """
+    Filled in by external_sort:
+    - runs / run_bytes: initial sorted runs and their size on disk
+    - merge_passes: intermediate merge passes needed to get down to fan_in runs
+    - bytes_written: everything written to run files, merge passes included
+    """
+    def __init__(self):
+        self.runs = 0
+        self.run_bytes = 0
+        self.merge_passes = 0
+        self.bytes_written = 0
+
+
+def external_sort(
+    records: Iterable[Any],
+    comparator: Optional[Comparator] = None,
+    descending: bool = False,
+    memory_limit: int = 256 << 20,
+    fan_in: int = 64,
+    processes: Optional[int] = None,
+    tmp_dir: Optional[str] = None,
+    stats: Optional[ExternalSortStats] = None,
+) -> Iterator[Any]:
+    """
+    Sorts an iterable that may not fit in memory and streams the sorted records.
+
+    - The input is cut into runs of about memory_limit / (processes + 1) bytes; runs are
+      sorted and written to temporary files in the block format above by a process pool
+      (in-process when processes is 1), with at most processes runs in flight
+    - While there are more than fan_in runs, groups of fan_in runs are merged into
+      longer runs in parallel; the last fan_in runs are k-way merged with a heap
+      as the output is consumed
+    - comparator is a cmp-style function (a, b) -> int and must be picklable (module
+      level) when processes > 1; equal records keep their input order
+    - Temporary files are removed once the output is exhausted or the generator is closed
+
+    Raises ValueError for a non-positive memory_limit or a fan_in below 2.
+    """
+    if memory_limit <= 0:
+        raise ValueError("memory_limit must be positive")
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    processes = processes or os.cpu_count() or 1
+    stats = stats if stats is not None else ExternalSortStats()
+    # Arguments are checked above at call time; the sort itself starts on the first next()
+    return _external_sort(records, comparator, descending, memory_limit, fan_in, processes, tmp_dir, stats)
+
+
+def _external_sort(
+    records: Iterable[Any],
+    comparator: Optional[Comparator],
+    descending: bool,
+    memory_limit: int,
+    fan_in: int,
+    processes: int,
+    tmp_dir: Optional[str],
+    stats: ExternalSortStats,
+) -> Iterator[Any]:
+    key = _sort_key(comparator)
+    with tempfile.TemporaryDirectory(prefix='external-sort-', dir=tmp_dir) as directory:
+        paths = (os.path.join(directory, f'run-{index}.bin') for index in count())
+        chunks = _chunk_by_memory(records, max(1, memory_limit // (processes + 1)))
+        runs: List[str] = []
+        with multiprocessing.Pool(processes) if processes > 1 else nullcontext() as pool:
+            submit = pool.apply_async if pool is not None else _run_now
+
+            # Sort runs, keeping at most `processes` chunks in flight
+            pending = deque()
+            for chunk in chunks:
+                pending.append(submit(_sort_run, ((next(paths), chunk, comparator, descending),)))
+                del chunk
+                if len(pending) >= processes:
+                    runs.append(_finish_run(pending.popleft(), stats, initial=True))
+            while pending:
+                runs.append(_finish_run(pending.popleft(), stats, initial=True))
+
+            # Intermediate passes until a single heap merge of at most fan_in runs is left
+            while len(runs) > fan_in:
+                stats.merge_passes += 1
+                groups = [runs[i:i + fan_in] for i in range(0, len(runs), fan_in)]
+                results = [submit(_merge_runs, ((next(paths), group, comparator, descending),))
+                           for group in groups]
+                runs = [_finish_run(result, stats) for result in results]
+
+        yield from heapq.merge(*map(read_run, runs), key=key, reverse=descending)
+
+
+class _Done:
+    """Stands in for AsyncResult when work runs in-process"""
+    def __init__(self, value: Any):
+        self.value = value
+
+    def get(self) -> Any:
+        return self.value
+
+
+def _run_now(function: Callable, args: tuple) -> _Done:
+    return _Done(function(*args))
+
+
+def _finish_run(result: Any, stats: ExternalSortStats, initial: bool = False) -> str:
+    path, size = result.get()
+    stats.bytes_written += size
+    if initial:
+        stats.runs += 1
+        stats.run_bytes += size
+    return path
+
+
+def benchmark_external_sort(
+    n_records: int = 2_000_000,
+    memory_limit: int = 32 << 20,
+    fan_in: int = 16,
+    processes: Optional[int] = None,
+) -> None:
+    """
+    Sorts random int64 and short string records with a memory limit well below the
+    input size and reports throughput in MB/s of run-format input, next to sorted()
+    """
+    rng = random.Random(0)
+    inputs = {
+        'int64': [rng.getrandbits(63) for _ in range(n_records)],
+        'str': [format(rng.getrandbits(64), 'x') for _ in range(n_records)],
+    }
+    print(f"{'input':>8} {'runs':>5} {'passes':>6} {'MB':>8} {'seconds':>8} {'MB/s':>7} {'sorted() s':>10}")
+    for name, records in inputs.items():
+        stats = ExternalSortStats()
+        started = time.perf_counter()
+        output = list(external_sort(records, memory_limit=memory_limit, fan_in=fan_in,
+                                    processes=processes, stats=stats))
+        elapsed = time.perf_counter() - started
+        started = time.perf_counter()
+        expected = sorted(records)
+        in_memory = time.perf_counter() - started
+        # Checked explicitly rather than with assert, which python -O would skip
+        if output != expected:
+            raise AssertionError(f"external_sort output differs from sorted() on {name} records")
+        megabytes = stats.run_bytes / 1e6
+        print(f"{name:>8} {stats.runs:>5} {stats.merge_passes:>6} {megabytes:>8.1f} {elapsed:>8.2f} "
+              f"{megabytes / elapsed:>7.1f} {in_memory:>10.2f}")
+
+
+# Parallel sort
+# Numeric input is copied once into a shared-memory buffer; workers sort their chunk in
+# place and merge into a second buffer, so only buffer names and offsets are pickled.
+# Other input (and any sort with a comparator) travels to workers pickled.
+_NUMERIC_TYPECODES = 'bBhHiIlLqQfd'
+
+
+class SortMetrics:
+    """
+    Optional instrumentation for parallel_sort; pass None (the default) to skip it.
+
+    - phase_seconds: wall time of each phase (load, sort, partition, merge, store)
+    - worker_busy: seconds each worker process spent on tasks, by pid
+    - utilization(): busy time over wall time x workers for the pooled phases
+    - bytes_moved: bytes copied into, between and out of buffers or pickled to workers
+    - comparisons and swaps are only counted with count_operations=True, which routes
+      every comparison through a counting wrapper and is much slower; swaps is the
+      minimum number of swaps equivalent to each chunk sort's permutation; only
+      ordering (<) comparisons are counted
+    """
+    POOLED_PHASES = ('sort', 'merge')
+
+    def __init__(self, count_operations: bool = False):
+        self.count_operations = count_operations
+        self.workers = 0
+        self.comparisons = 0
+        self.swaps = 0
+        self.bytes_moved = 0
+        self.phase_seconds: Dict[str, float] = {}
+        self.worker_busy: Dict[int, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def record_task(self, stats: Tuple[int, int, float, int]) -> None:
+        comparisons, swaps, busy, pid = stats
+        self.comparisons += comparisons
+        self.swaps += swaps
+        self.worker_busy[pid] = self.worker_busy.get(pid, 0.0) + busy
+
+    def utilization(self) -> float:
+        wall = sum(self.phase_seconds.get(phase, 0.0) for phase in self.POOLED_PHASES)
+        if not wall or not self.workers:
+            return 0.0
+        return sum(self.worker_busy.values()) / (wall * self.workers)
+
+    def __repr__(self) -> str:
+        phases = ', '.join(f'{name}={seconds:.3f}s' for name, seconds in self.phase_seconds.items())
+        return (f"SortMetrics(workers={self.workers}, comparisons={self.comparisons}, swaps={self.swaps}, "
+                f"bytes_moved={self.bytes_moved}, utilization={self.utilization():.0%}, {phases})")
+
+
+def _counting_key(key: Optional[Callable[[Any], Any]], counter: List[int]) -> Callable[[Any], Any]:
+    class Counted:
+        __slots__ = ('value',)
+
+        def __init__(self, item: Any):
+            self.value = item if key is None else key(item)
+
+        def __lt__(self, other: 'Counted') -> bool:
+            counter[0] += 1
+            return self.value < other.value
+
+        def __eq__(self, other: object) -> bool:
+            # heapq.merge compares [key, order, ...] lists, which checks equality first
+            return isinstance(other, Counted) and self.value == other.value
+
+    return Counted
+
+
+def _counted_sort(items: List[Any], key: Optional[Callable[[Any], Any]], descending: bool,
+                  counter: List[int]) -> Tuple[List[Any], int]:
+    """Sorts with counted comparisons; returns the sorted list and the swaps its permutation needs"""
+    keys = list(map(_counting_key(key, counter), items))
+    order = sorted(range(len(items)), key=keys.__getitem__, reverse=descending)
+    # A permutation with c cycles is n - c swaps away from the identity
+    seen = bytearray(len(order))
+    cycles = 0
+    for start in range(len(order)):
+        if not seen[start]:
+            cycles += 1
+            position = start
+            while not seen[position]:
+                seen[position] = 1
+                position = order[position]
+    return [items[i] for i in order], len(order) - cycles
+
+
+def _numeric_view(buffer: shared_memory.SharedMemory, typecode: str, n: int) -> Any:
+    if np is not None:
+        return np.ndarray((n,), dtype=typecode, buffer=buffer.buf)
+    return buffer.buf[:n * array(typecode).itemsize].cast(typecode)
+
+
+def _sort_shared_chunk(task: Tuple[str, str, int, int, int, bool]) -> Tuple[int, int, float, int]:
+    name, typecode, n, lo, hi, counting = task
+    started = time.perf_counter()
+    buffer = shared_memory.SharedMemory(name=name)
+    try:
+        view = _numeric_view(buffer, typecode, n)
+        counter, swaps = [0], 0
+        if counting:
+            items, swaps = _counted_sort(view[lo:hi].tolist(), None, False, counter)
+            view[lo:hi] = np.array(items, dtype=typecode) if np is not None else array(typecode, items)
+        elif np is not None:
+            view[lo:hi].sort()
+        else:
+            view[lo:hi] = array(typecode, sorted(view[lo:hi]))
+        del view
+    finally:
+        buffer.close()
+    return counter[0], swaps, time.perf_counter() - started, os.getpid()
+
+
+def _merge_shared_part(task: Tuple[str, str, str, int, List[Tuple[int, int]], int, bool]) -> Tuple[int, int, float, int]:
+    source_name, target_name, typecode, n, ranges, offset, counting = task
+    started = time.perf_counter()
+    source, target = shared_memory.SharedMemory(name=source_name), shared_memory.SharedMemory(name=target_name)
+    try:
+        src, dst = _numeric_view(source, typecode, n), _numeric_view(target, typecode, n)
+        size = sum(hi - lo for lo, hi in ranges)
+        counter = [0]
+        if counting:
+            merged = heapq.merge(*(src[lo:hi].tolist() for lo, hi in ranges), key=_counting_key(None, counter))
+            dst[offset:offset + size] = (np.array(list(merged), dtype=typecode) if np is not None
+                                         else array(typecode, merged))
+        elif np is not None:
+            # Stable sort of concatenated runs is a run-aware merge (timsort or radix)
+            dst[offset:offset + size] = np.sort(np.concatenate([src[lo:hi] for lo, hi in ranges]), kind='stable')
+        else:
+            dst[offset:offset + size] = array(typecode, heapq.merge(*(src[lo:hi] for lo, hi in ranges)))
+        del src, dst
+    finally:
+        source.close()
+        target.close()
+    return counter[0], 0, time.perf_counter() - started, os.getpid()
+
+
+def _sort_pickled_chunk(task: Tuple[bytes, Optional[Comparator], bool, bool]) -> Tuple[bytes, Tuple[int, int, float, int]]:
+    payload, comparator, descending, counting = task
+    started = time.perf_counter()
+    items = pickle.loads(payload)
+    counter, swaps = [0], 0
+    if counting:
+        items, swaps = _counted_sort(items, _sort_key(comparator), descending, counter)
+    else:
+        items.sort(key=_sort_key(comparator), reverse=descending)
+    payload = pickle.dumps(items, pickle.HIGHEST_PROTOCOL)
+    return payload, (counter[0], swaps, time.perf_counter() - started, os.getpid())
+
+
+def _merge_pickled_part(task: Tuple[bytes, Optional[Comparator], bool, bool]) -> Tuple[bytes, Tuple[int, int, float, int]]:
+    payload, comparator, descending, counting = task
+    started = time.perf_counter()
+    runs = pickle.loads(payload)
+    counter = [0]
+    key = _sort_key(comparator)
+    if counting:
+        key = _counting_key(key, counter)
+    merged = list(heapq.merge(*runs, key=key, reverse=descending))
+    payload = pickle.dumps(merged, pickle.HIGHEST_PROTOCOL)
+    return payload, (counter[0], 0, time.perf_counter() - started, os.getpid())
+
+
+def _numeric_typecode(data: Any, comparator: Optional[Comparator]) -> Optional[str]:
+    """Typecode of the shared-memory buffer for data, or None when it must be pickled"""
+    if comparator is not None:
+        return None
+    if isinstance(data, array):
+        return data.typecode if data.typecode in _NUMERIC_TYPECODES else None
+    if np is not None and isinstance(data, np.ndarray):
+        return data.dtype.char if data.ndim == 1 and data.dtype.char in _NUMERIC_TYPECODES else None
+    if not isinstance(data, list) or not data:
+        return None
+    kind = type(data[0])
+    if kind not in (int, float) or any(type(item) is not kind for item in data):
+        return None
+    if kind is int and not (_INT64[0] <= min(data) and max(data) < _INT64[1]):
+        return None
+    return 'q' if kind is int else 'd'
+
+
+def _split_points(runs: List[Any], parts: int, key: Callable[[Any], Any]) -> List[List[int]]:
+    """
+    Cuts every sorted run at the same parts - 1 splitter keys drawn from a regular
+    sample of all runs, so part j of every run can be merged independently.
+    Returns, for each run, the parts + 1 cut positions.
+    """
+    samples = sorted(key(run[i * len(run) // (parts * 4)]) for run in runs
+                     for i in range(parts * 4) if len(run))
+    splitters = [samples[j * len(samples) // parts] for j in range(1, parts)] if samples else []
+    return [[0] + [bisect.bisect_left(run, splitter, key=key) for splitter in splitters] + [len(run)]
+            for run in runs]
+
+
+class _Descending:
+    """Key wrapper that flips the order, for cutting runs sorted in descending order"""
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+
+def parallel_sort(
+    data: Any,
+    comparator: Optional[Comparator] = None,
+    descending: bool = False,
+    processes: Optional[int] = None,
+    min_chunk: int = 1 << 16,
+    metrics: Optional[SortMetrics] = None,
+) -> Any:
+    """
+    Sorts data on a process pool and returns a new sorted sequence of the same kind
+    (list, tuple, array.array or NumPy array; other sequences give a list); data is
+    not modified.
+
+    1. Split into one chunk per worker (fewer when chunks would be below min_chunk)
+    2. Sort the chunks in parallel
+    3. Cut every sorted chunk at shared splitters (sampled quantiles)
+    4. Merge part j of every chunk in parallel into its own slice of the output
+
+    Lists of int64-range ints or floats, numeric array.array and 1-D NumPy arrays go
+    through shared memory (NumPy sorts them without boxing when installed). Anything
+    else, or any sort with a comparator, is pickled to the workers; a comparator must
+    then be picklable. Equal items keep their input order.
+    """
+    processes = processes or os.cpu_count() or 1
+    n = len(data)
+    workers = max(1, min(processes, n // max(1, min_chunk)))
+    if metrics is not None:
+        metrics.workers = workers
+    phase = metrics.phase if metrics is not None else (lambda name: nullcontext())
+    counting = metrics is not None and metrics.count_operations
+    record = metrics.record_task if metrics is not None else (lambda stats: None)
+    bounds = [(i * n // workers, (i + 1) * n // workers) for i in range(workers)]
+    typecode = _numeric_typecode(data, comparator)
+
+    with ExitStack() as stack:
+        if typecode is not None:
+            # Created before the pool so forked workers share this process's resource tracker
+            itemsize = array(typecode).itemsize
+            source = _shared_buffer(stack, n * itemsize)
+            target = _shared_buffer(stack, n * itemsize)
+        pool = stack.enter_context(multiprocessing.Pool(workers)) if workers > 1 else None
+        submit = pool.apply_async if pool is not None else _run_now
+        if typecode is None:
+            output = _parallel_sort_pickled(data, comparator, descending, bounds, submit, phase, record, metrics, counting)
+            return _same_kind(data, output)
+
+        with phase('load'):
+            if isinstance(data, list):
+                staged = array(typecode, data)
+            elif isinstance(data, array):
+                staged = data
+            else:
+                # typecodes are native-endian, so byte-swapped input is staged in native order
+                staged = np.ascontiguousarray(data, dtype=data.dtype.newbyteorder('='))
+            source.buf[:n * itemsize] = memoryview(staged).cast('B')
+            del staged
+        with phase('sort'):
+            results = [submit(_sort_shared_chunk, ((source.name, typecode, n, lo, hi, counting),)) for lo, hi in bounds]
+            for result in results:
+                record(result.get())
+        with phase('partition'):
+            src = _numeric_view(source, typecode, n)
+            cuts = _split_points([src[lo:hi] for lo, hi in bounds], workers, lambda value: value)
+            del src
+        with phase('merge'):
+            results, offset = [], 0
+            for j in range(workers):
+                ranges = [(lo + cut[j], lo + cut[j + 1]) for (lo, _), cut in zip(bounds, cuts)]
+                results.append(submit(_merge_shared_part,
+                                      ((source.name, target.name, typecode, n, ranges, offset, counting),)))
+                offset += sum(hi - lo for lo, hi in ranges)
+            for result in results:
+                record(result.get())
+        with phase('store'):
+            output = array(typecode)
+            output.frombytes(target.buf[:n * itemsize])
+            if descending:
+                output.reverse()
+            if isinstance(data, list):
+                output = output.tolist()
+            elif np is not None and isinstance(data, np.ndarray):
+                output = np.frombuffer(output, dtype=data.dtype.newbyteorder('=')).astype(data.dtype)
+        if metrics is not None:
+            # Copy in, merge into the second buffer, copy out
+            metrics.bytes_moved += 3 * n * itemsize
+        return output
+
+
+def _same_kind(data: Any, items: List[Any]) -> Any:
+    """Rebuilds a sorted list as the container type of data"""
+    if isinstance(data, array):
+        return array(data.typecode, items)
+    if np is not None and isinstance(data, np.ndarray):
+        return np.array(items, dtype=data.dtype)
+    if isinstance(data, tuple):
+        return tuple(items)
+    return items
+
+
+def _shared_buffer(stack: ExitStack, size: int) -> shared_memory.SharedMemory:
+    buffer = shared_memory.SharedMemory(create=True, size=max(1, size))
+    stack.callback(buffer.unlink)
+    stack.callback(buffer.close)
+    return buffer
+
+
+def _parallel_sort_pickled(data, comparator, descending, bounds, submit, phase, record, metrics, counting) -> Any:
+    moved = 0
+    with phase('sort'):
+        payloads = [pickle.dumps(list(data[lo:hi]), pickle.HIGHEST_PROTOCOL) for lo, hi in bounds]
+        results = [submit(_sort_pickled_chunk, ((payload, comparator, descending, counting),)) for payload in payloads]
+        moved += sum(map(len, payloads))
+        runs = []
+        for result in results:
+            payload, stats = result.get()
+            moved += len(payload)
+            runs.append(pickle.loads(payload))
+            record(stats)
+    with phase('partition'):
+        key = _sort_key(comparator) or (lambda item: item)
+        cut_key = (lambda item: _Descending(key(item))) if descending else key
+        cuts = _split_points(runs, len(bounds), cut_key)
+    with phase('merge'):
+        payloads = [pickle.dumps([run[cut[j]:cut[j + 1]] for run, cut in zip(runs, cuts)], pickle.HIGHEST_PROTOCOL)
+                    for j in range(len(bounds))]
+        del runs
+        results = [submit(_merge_pickled_part, ((payload, comparator, descending, counting),)) for payload in payloads]
+        moved += sum(map(len, payloads))
+        output = []
+        for result in results:
+            payload, stats = result.get()
+            moved += len(payload)
+            output.extend(pickle.loads(payload))
+            record(stats)
+    if metrics is not None:
+        metrics.bytes_moved += moved
+    return output
+
+
+def _natural_order(a: Any, b: Any) -> int:
+    """Module-level comparator, so worker processes can unpickle it"""
+    return (a > b) - (a < b)
+
+
+def check_parallel_sort(n: int = 200_000, processes: int = 4, seed: int = 0) -> None:
+    """
+    Compares parallel_sort with sorted() on each input kind it handles, including
+    byte-swapped NumPy arrays and comparator sorts, and checks that the container
+    type is kept. Raises AssertionError on the first mismatch.
+    """
+    rng = random.Random(seed)
+    ints = [rng.randrange(-1000, 1000) for _ in range(n)]
+    cases = {
+        'int list': ints,
+        'float array': array('d', (rng.random() for _ in range(n))),
+        'str tuple': tuple(format(rng.getrandbits(32), 'x') for _ in range(n // 4)),
+        'float array, comparator': (array('d', (rng.random() for _ in range(n // 4))), _natural_order),
+    }
+    if np is not None:
+        cases['int32 ndarray'] = np.array(ints, dtype='<i4')
+        cases['big-endian int32 ndarray'] = np.array(ints, dtype='>i4')
+        cases['big-endian float64 ndarray'] = np.array(ints, dtype='>f8') / 7
+    for name, case in cases.items():
+        data, comparator = case if isinstance(case, tuple) and callable(case[-1]) else (case, None)
+        for descending in (False, True):
+            result = parallel_sort(data, comparator, descending, processes=processes, min_chunk=1 << 12)
+            if type(result) is not type(data) or list(result) != sorted(data, reverse=descending):
+                raise AssertionError(f"parallel_sort is wrong on {name} (descending={descending})")
+            if np is not None and isinstance(data, np.ndarray) and result.dtype != data.dtype:
+                raise AssertionError(f"parallel_sort changed the dtype of {name}")
+    print(f"check_parallel_sort: {len(cases)} input kinds OK")
+
+
+def benchmark_parallel_sort(n: int = 2_000_000, processes: Optional[int] = None) -> None:
+    """Times parallel_sort with metrics on float64, int64 list and string input against sorted()"""
+    rng = random.Random(0)
+    inputs = {
+        'float64 array': array('d', (rng.random() for _ in range(n))),
+        'int list': [rng.getrandbits(62) for _ in range(n)],
+        'str list': [format(rng.getrandbits(64), 'x') for _ in range(n // 4)],
+    }
+    for name, data in inputs.items():
+        started = time.perf_counter()
+        expected = sorted(data)
+        baseline = time.perf_counter() - started
+        metrics = SortMetrics()
+        started = time.perf_counter()
+        result = parallel_sort(data, processes=processes, metrics=metrics)
+        elapsed = time.perf_counter() - started
+        assert list(result) == expected
+        print(f"{name:>14}: parallel_sort {elapsed:.2f}s, sorted() {baseline:.2f}s")
+        print(f"{'':>16}{metrics!r}")
+
+
+if __name__ == '__main__':
+    check_parallel_sort()
+    benchmark_external_sort()
+    benchmark_parallel_sort()
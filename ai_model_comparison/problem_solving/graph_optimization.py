@@ -43,4 +43,498 @@ Compare how each AI model:
 - Explains their reasoning process
 - Addresses edge cases and failure scenarios
 - Provides optimization strategies
-""" 
\ No newline at end of file
+"""
+
+
+import heapq
+import math
+import random
+import time
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+
+INF = float('inf')
+CRITERIA = ('latency', 'cost', 'reliability')
+
+
+class Link(NamedTuple):
+    """A directed channel; reliability is a probability, risk = -log(reliability) adds up along a path"""
+    target: Hashable
+    latency: float
+    cost: float
+    risk: float
+    capacity: float
+
+
+class Route(NamedTuple):
+    path: List[Hashable]
+    latency: float
+    cost: float
+    reliability: float
+    bottleneck: float
+
+
+class RouteResult(NamedTuple):
+    """
+    best: cheapest route by the objective that meets every constraint, or None
+    pareto: non-dominated alternatives (latency, cost, reliability), best objective first;
+            when nothing is feasible these are the relaxed trade-offs that come closest
+    feasible: best is not None
+    complete: the search finished; False when the time budget or label cap stopped it
+    labels: labels created, a measure of search effort
+    """
+    best: Optional[Route]
+    pareto: List[Route]
+    feasible: bool
+    complete: bool
+    labels: int
+
+
+class NetworkOptimizer:
+    """
+    Constrained routing over a directed network whose links carry latency, cost,
+    reliability and capacity.
+
+    find_route is a multi-criteria label-setting search (Martins' algorithm):
+    - A label is (latency, cost, risk) of one partial path; each node keeps only
+      labels no other label there dominates (<= in all three criteria)
+    - Links below the requested demand are skipped (capacity limits)
+    - One reverse Dijkstra per criterion from the target gives lower bounds for
+      the rest of the path; labels whose bound breaks the budget, reliability or
+      latency limit, or that a route already found dominates, are dropped. This
+      is what keeps the search small on 100k-node networks
+    - Labels are expanded by objective + lower bound (A*-style), so the first
+      route to reach the target is optimal for the objective; the search then
+      continues to collect the Pareto set of feasible alternatives
+    - time_budget makes it anytime: when time runs out the best route found so
+      far is returned with complete=False
+    If no route meets every constraint, the search is repeated without the limits
+    and returns the Pareto set of trade-offs so callers can pick what to relax.
+
+    Worst case is exponential in the number of labels; in practice the bounds and
+    dominance keep it close to a few Dijkstra runs. Memory is O(labels).
+    """
+    def __init__(self):
+        self.links: Dict[Hashable, List[Link]] = defaultdict(list)
+        self._reverse: Optional[Dict[Hashable, List[Tuple[Hashable, Link]]]] = None
+
+    def add_link(self, source: Hashable, target: Hashable, latency: float, cost: float,
+                 reliability: float = 1.0, capacity: float = INF) -> None:
+        if latency < 0 or cost < 0:
+            raise ValueError("latency and cost must be non-negative")
+        if not 0 < reliability <= 1:
+            raise ValueError("reliability must be in (0, 1]")
+        self.links[source].append(Link(target, latency, cost, -math.log(reliability), capacity))
+        self.links.setdefault(target, [])
+        self._reverse = None
+
+    def remove_link(self, source: Hashable, target: Hashable) -> None:
+        """Drops every link source -> target, e.g. after a failure"""
+        remaining = [link for link in self.links.get(source, ()) if link.target != target]
+        if len(remaining) == len(self.links.get(source, ())):
+            raise KeyError(f"No link {source} -> {target}")
+        self.links[source] = remaining
+        self._reverse = None
+
+    def set_capacity(self, source: Hashable, target: Hashable, capacity: float) -> None:
+        self.links[source] = [link._replace(capacity=capacity) if link.target == target else link
+                              for link in self.links[source]]
+        self._reverse = None
+
+    def _reversed(self) -> Dict[Hashable, List[Tuple[Hashable, Link]]]:
+        if self._reverse is None:
+            self._reverse = defaultdict(list)
+            for source, links in self.links.items():
+                for link in links:
+                    self._reverse[link.target].append((source, link))
+        return self._reverse
+
+    def _lower_bounds(self, target: Hashable, weights: Tuple[float, float, float],
+                      demand: float) -> Tuple[Dict[Hashable, float], Dict[Hashable, Link]]:
+        """
+        Dijkstra toward target over links weighted by weights . (latency, cost, risk).
+        Returns the distance of every node that can reach target and its next link
+        on a shortest path there.
+        """
+        reverse = self._reversed()
+        w_latency, w_cost, w_risk = weights
+        bound = {target: 0.0}
+        hop: Dict[Hashable, Link] = {}
+        heap = [(0.0, target)]
+        while heap:
+            d, v = heapq.heappop(heap)
+            if d > bound[v]:
+                continue
+            for u, link in reverse.get(v, ()):
+                if link.capacity < demand:
+                    continue
+                nd = d + w_latency * link.latency + w_cost * link.cost + w_risk * link.risk
+                if nd < bound.get(u, INF):
+                    bound[u] = nd
+                    hop[u] = link
+                    heapq.heappush(heap, (nd, u))
+        return bound, hop
+
+    def _lagrangian(self, source, target, limits, objective, demand, deadline, iterations, searches):
+        """
+        Lagrangian relaxation of the limits: for multipliers mu >= 0, the shortest path
+        under objective + mu . resources, minus mu . limits, is a lower bound on the
+        constrained optimum, and every such path that happens to be feasible is an
+        upper bound. Multipliers follow Polyak subgradient steps for a few iterations,
+        with the step factor halved whenever the bound stops improving.
+        searches are the single-criterion (bound, hop) trees, whose paths seed the
+        incumbent. Returns (guide, incumbent): the strongest bound as (weights,
+        distances, constant) and the best feasible path found, as (values, Route) or None.
+        """
+        unit = tuple(1.0 if i == objective else 0.0 for i in range(3))
+        bound, hop = searches[objective]
+        guide = (unit, bound, 0.0)
+        best_dual = bound[source]
+        incumbent = None
+        # Until a feasible path turns up, the worst objective seen stands in for the optimum
+        worst = 0.0
+        for _, other in searches:
+            values, route = self._hop_route(source, target, other)
+            worst = max(worst, values[objective])
+            if all(values[i] <= limits[i] for i in range(3)):
+                if incumbent is None or values[objective] < incumbent[0][objective]:
+                    incumbent = (values, route)
+        mu = [0.0, 0.0, 0.0]
+        theta = 1.0
+        for iteration in range(iterations):
+            if iteration:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                weights = tuple(unit[i] + mu[i] for i in range(3))
+                bound, hop = self._lower_bounds(target, weights, demand)
+                constant = sum(mu[i] * limits[i] for i in range(3) if mu[i])
+                dual = bound[source] - constant
+                if dual > best_dual:
+                    best_dual, guide = dual, (weights, bound, constant)
+                else:
+                    theta /= 2
+            values, route = self._hop_route(source, target, hop)
+            if all(values[i] <= limits[i] for i in range(3)):
+                if incumbent is None or values[objective] < incumbent[0][objective]:
+                    incumbent = (values, route)
+            worst = max(worst, values[objective])
+            upper = incumbent[0][objective] if incumbent is not None else worst
+            if incumbent is not None and best_dual >= upper * (1 - 1e-9):
+                break
+            # Components that would push a multiplier below zero do not move it
+            gradient = [values[i] - limits[i] if limits[i] < INF and (values[i] > limits[i] or mu[i]) else 0.0
+                        for i in range(3)]
+            norm = sum(g * g for g in gradient)
+            if not norm:
+                break
+            step = theta * max(upper - best_dual, 1e-9 * abs(upper)) / norm
+            mu = [max(0.0, mu[i] + step * gradient[i]) for i in range(3)]
+        return guide, incumbent
+
+    @staticmethod
+    def _hop_route(source, target, hop) -> Tuple[Tuple[float, float, float], Route]:
+        path, latency, cost, risk, bottleneck = [source], 0.0, 0.0, 0.0, INF
+        node = source
+        while node != target:
+            link = hop[node]
+            latency, cost, risk = latency + link.latency, cost + link.cost, risk + link.risk
+            bottleneck = min(bottleneck, link.capacity)
+            node = link.target
+            path.append(node)
+        return (latency, cost, risk), Route(path, latency, cost, math.exp(-risk), bottleneck)
+
+    def find_route(
+        self,
+        source: Hashable,
+        target: Hashable,
+        budget: float = INF,
+        min_reliability: float = 0.0,
+        max_latency: float = INF,
+        demand: float = 0.0,
+        objective: str = 'latency',
+        time_budget: Optional[float] = None,
+        max_labels: int = 5_000_000,
+        alternatives: bool = True,
+        relax: float = 2.0,
+        epsilon: float = 0.0,
+        lagrangian_iterations: int = 8,
+    ) -> RouteResult:
+        """
+        Routes demand units from source to target within budget (total cost),
+        min_reliability (product of link reliabilities, 0.99 for 99%) and
+        max_latency, optimizing objective ('latency', 'cost' or 'reliability').
+        alternatives=False stops at the optimum instead of collecting the Pareto set.
+        When nothing is feasible, the alternatives come from a second search with every
+        limit loosened by the factor relax (reliability to min_reliability ** relax).
+        epsilon > 0 trades exactness for speed: a label is also dropped when another one
+        at the same node is within a factor 1 + epsilon of it in every criterion, which
+        keeps the label sets small on large meshes.
+        lagrangian_iterations reverse Dijkstras on penalized weights run first: they give
+        a feasible route to start from and a tighter bound to order and prune labels by.
+        """
+        if source not in self.links or target not in self.links:
+            raise KeyError(f"Unknown node: {source if source not in self.links else target}")
+        if objective not in CRITERIA:
+            raise ValueError(f"objective must be one of {CRITERIA}")
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        max_risk = INF if min_reliability <= 0 else -math.log(min_reliability)
+        # Bounds are summed target-first, labels source-first: allow for the rounding gap
+        limits = tuple(limit * (1 + 1e-9) for limit in (max_latency, budget, max_risk))
+        objective = CRITERIA.index(objective)
+        searches = [self._lower_bounds(target, tuple(float(i == criterion) for i in range(3)), demand)
+                    for criterion in range(3)]
+        bounds = [bound for bound, _ in searches]
+        if source not in bounds[0]:
+            return RouteResult(None, [], False, True, 0)
+        guide, incumbent = self._lagrangian(source, target, limits, objective, demand, deadline,
+                                            lagrangian_iterations, searches)
+        result = self._search(source, target, limits, bounds, guide, incumbent, demand, objective,
+                              deadline, max_labels, alternatives, epsilon)
+        if result.feasible or not result.complete or limits == (INF, INF, INF):
+            return result
+        # Nothing meets every limit: report the trade-offs within loosened limits instead
+        unguided = (guide[0] if guide[2] == 0.0 else tuple(float(i == objective) for i in range(3)),
+                    bounds[objective], 0.0)
+        relaxed = self._search(source, target, tuple(limit * relax for limit in limits), bounds, unguided,
+                               None, demand, objective, deadline, max_labels, True, epsilon)
+        return RouteResult(None, relaxed.pareto, False, relaxed.complete, result.labels + relaxed.labels)
+
+    def _search(self, source, target, limits, bounds, guide, seed, demand, objective, deadline, max_labels,
+                alternatives, epsilon) -> RouteResult:
+        lat_bound, cost_bound, risk_bound = bounds
+        max_latency, budget, max_risk = limits
+        if source not in lat_bound:
+            return RouteResult(None, [], False, True, 0)
+        # Labels are expanded in order of the guide's lower bound on the objective of any
+        # feasible completion: weights . criteria + distance to target - constant
+        (w_latency, w_cost, w_risk), guide_bound, constant = guide
+        # Label store: criteria, node, parent label and bottleneck, indexed by label id
+        criteria: List[Tuple[float, float, float]] = [(0.0, 0.0, 0.0)]
+        nodes = [source]
+        parents = [-1]
+        bottlenecks = [INF]
+        alive = bytearray(b'\x01')
+        bags: Dict[Hashable, List[int]] = defaultdict(list, {source: [0]})
+        found: List[int] = []
+        heap = [(guide_bound[source] - constant, 0.0, 0)]
+        complete = True
+        popped = 0
+        incumbent = seed[0][objective] if seed is not None and not alternatives else INF
+        slack = 1.0 + epsilon
+
+        def dominated(values: Tuple[float, float, float], candidates: Iterable[int]) -> bool:
+            lat, cost, risk = values[0] * slack, values[1] * slack, values[2] * slack
+            for other in candidates:
+                o = criteria[other]
+                if o[0] <= lat and o[1] <= cost and o[2] <= risk:
+                    return True
+            return False
+
+        while heap:
+            popped += 1
+            if deadline is not None and not popped & 255 and time.perf_counter() > deadline:
+                complete = False
+                break
+            if len(criteria) > max_labels:
+                complete = False
+                break
+            key, _, label = heapq.heappop(heap)
+            if key >= incumbent:
+                break
+            if not alive[label]:
+                continue
+            node = nodes[label]
+            if node == target:
+                continue
+            lat, cost, risk = criteria[label]
+            for link in self.links[node]:
+                v = link.target
+                if link.capacity < demand or v not in lat_bound:
+                    continue
+                values = (lat + link.latency, cost + link.cost, risk + link.risk)
+                # Prune on the best possible completion of this partial path
+                optimistic = (values[0] + lat_bound[v], values[1] + cost_bound[v], values[2] + risk_bound[v])
+                if optimistic[0] > max_latency or optimistic[1] > budget or optimistic[2] > max_risk:
+                    continue
+                if optimistic[objective] >= incumbent:
+                    continue
+                if dominated(values, bags[v]) or dominated(optimistic, found):
+                    continue
+                # The new label evicts the labels it dominates at v
+                survivors = []
+                for other in bags[v]:
+                    o = criteria[other]
+                    if values[0] <= o[0] and values[1] <= o[1] and values[2] <= o[2]:
+                        alive[other] = 0
+                    else:
+                        survivors.append(other)
+                new = len(criteria)
+                criteria.append(values)
+                nodes.append(v)
+                parents.append(label)
+                bottlenecks.append(min(bottlenecks[label], link.capacity))
+                alive.append(1)
+                survivors.append(new)
+                bags[v] = survivors
+                if v == target:
+                    found = [other for other in found if alive[other]] + [new]
+                    if not alternatives:
+                        incumbent = min(incumbent, values[objective])
+                key = w_latency * values[0] + w_cost * values[1] + w_risk * values[2] + guide_bound[v] - constant
+                heapq.heappush(heap, (key, values[0], new))
+
+        # Every label that reached the target met the limits when it was created
+        found = sorted((label for label in found if alive[label]),
+                       key=lambda label: (criteria[label][objective], criteria[label]))
+        routes = []
+        for label in found:
+            path = []
+            walk = label
+            while walk >= 0:
+                path.append(nodes[walk])
+                walk = parents[walk]
+            path.reverse()
+            lat, cost, risk = criteria[label]
+            routes.append(Route(path, lat, cost, math.exp(-risk), bottlenecks[label]))
+        if seed is not None:
+            # The Lagrangian incumbent stands in for the labels it pruned or outlasted
+            (lat, cost, risk), route = seed
+            if not any(r.latency <= lat and r.cost <= cost and -math.log(r.reliability) <= risk * (1 + 1e-12)
+                       for r in routes):
+                routes.append(route)
+                routes.sort(key=lambda r: ((r.latency, r.cost, -r.reliability)[objective],
+                                           r.latency, r.cost, -r.reliability))
+        best = routes[0] if routes else None
+        return RouteResult(best, routes, best is not None, complete, len(criteria))
+
+    def allocate(self, requests: Iterable[Tuple[Hashable, Hashable, float]], **constraints) -> List[RouteResult]:
+        """
+        Routes (source, target, demand) requests one after another, reserving each
+        chosen route's demand on its links so later requests see the residual capacity.
+        Greedy in request order: a sequential approximation of multi-commodity flow.
+        """
+        results = []
+        for source, target, demand in requests:
+            result = self.find_route(source, target, demand=demand, alternatives=False, **constraints)
+            if result.best is not None and demand > 0:
+                for u, v in zip(result.best.path, result.best.path[1:]):
+                    self._reserve(u, v, demand)
+                self._reverse = None
+            results.append(result)
+        return results
+
+    def _reserve(self, source: Hashable, target: Hashable, demand: float) -> None:
+        # Take capacity from the fastest link that can carry the demand
+        links = self.links[source]
+        candidates = [i for i, link in enumerate(links) if link.target == target and link.capacity >= demand]
+        i = min(candidates, key=lambda i: links[i].latency)
+        links[i] = links[i]._replace(capacity=links[i].capacity - demand)
+
+
+# Generated topologies for benchmarking
+def _random_link(network: NetworkOptimizer, rng: random.Random, u: int, v: int, distance: float = 1.0) -> None:
+    network.add_link(u, v, latency=distance * rng.uniform(1.0, 5.0), cost=rng.uniform(1.0, 10.0),
+                     reliability=rng.uniform(0.99, 0.9999), capacity=rng.choice((10.0, 40.0, 100.0)))
+
+
+def mesh_network(side: int, seed: int = 0) -> NetworkOptimizer:
+    """side x side grid, links in both directions"""
+    rng = random.Random(seed)
+    network = NetworkOptimizer()
+    for y in range(side):
+        for x in range(side):
+            node = y * side + x
+            for other in ((node + 1) if x + 1 < side else None, (node + side) if y + 1 < side else None):
+                if other is not None:
+                    _random_link(network, rng, node, other)
+                    _random_link(network, rng, other, node)
+    return network
+
+
+def geometric_network(nodes: int, neighbours: int = 4, seed: int = 0) -> NetworkOptimizer:
+    """Random points in the unit square, each linked both ways to its nearest neighbours; latency grows with distance"""
+    rng = random.Random(seed)
+    points = [(rng.random(), rng.random()) for _ in range(nodes)]
+    cells = max(1, int(math.sqrt(nodes / 2)))
+    grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+    for i, (x, y) in enumerate(points):
+        grid[int(x * cells), int(y * cells)].append(i)
+    network = NetworkOptimizer()
+    for i, (x, y) in enumerate(points):
+        cx, cy = int(x * cells), int(y * cells)
+        near = [j for dx in (-1, 0, 1) for dy in (-1, 0, 1) for j in grid.get((cx + dx, cy + dy), ()) if j != i]
+        near.sort(key=lambda j: (points[j][0] - x) ** 2 + (points[j][1] - y) ** 2)
+        for j in near[:neighbours]:
+            distance = math.hypot(points[j][0] - x, points[j][1] - y) * cells
+            _random_link(network, rng, i, j, distance)
+            _random_link(network, rng, j, i, distance)
+    return network
+
+
+def scale_free_network(nodes: int, links_per_node: int = 2, seed: int = 0) -> NetworkOptimizer:
+    """Barabasi-Albert preferential attachment, links in both directions"""
+    rng = random.Random(seed)
+    network = NetworkOptimizer()
+    endpoints = list(range(links_per_node))
+    for node in range(links_per_node, nodes):
+        for other in {rng.choice(endpoints) for _ in range(links_per_node)}:
+            _random_link(network, rng, node, other)
+            _random_link(network, rng, other, node)
+            endpoints += (node, other)
+    return network
+
+
+def benchmark_route_solver(nodes: int = 100_000, queries: int = 5, time_budget: float = 10.0,
+                           seed: int = 0) -> None:
+    """
+    Constrained queries on mesh, geometric and scale-free networks of about `nodes`
+    nodes. Limits are derived from each query's fastest and cheapest routes so they
+    bind: budget halfway between their costs, latency 1.3x the fastest, reliability
+    at least 98% of the less reliable of the two. Each query runs exact (optimum only)
+    and with epsilon=0.01 collecting alternatives, both under time_budget.
+    """
+    rng = random.Random(seed)
+    side = int(math.sqrt(nodes))
+    topologies = {
+        f'mesh {side}x{side}': lambda: mesh_network(side, seed),
+        f'geometric {nodes:,}': lambda: geometric_network(nodes, seed=seed),
+        f'scale-free {nodes:,}': lambda: scale_free_network(nodes, seed=seed),
+    }
+    modes = {
+        'exact': dict(alternatives=False),
+        'epsilon=0.01 + alternatives': dict(epsilon=0.01),
+    }
+    for name, build in topologies.items():
+        started = time.perf_counter()
+        network = build()
+        print(f"{name}: built in {time.perf_counter() - started:.1f}s")
+        node_ids = list(network.links)
+        stats = {mode: {'seconds': 0.0, 'labels': 0, 'feasible': 0, 'complete': 0, 'gap': 0.0} for mode in modes}
+        done = 0
+        for _ in range(queries):
+            source, target = rng.choice(node_ids), rng.choice(node_ids)
+            fastest = network.find_route(source, target, demand=10.0, alternatives=False).best
+            if fastest is None:
+                continue
+            cheapest = network.find_route(source, target, demand=10.0, objective='cost', alternatives=False).best
+            limits = dict(budget=(fastest.cost + cheapest.cost) / 2, max_latency=1.3 * fastest.latency,
+                          min_reliability=0.98 * min(fastest.reliability, cheapest.reliability), demand=10.0)
+            done += 1
+            for mode, options in modes.items():
+                started = time.perf_counter()
+                result = network.find_route(source, target, time_budget=time_budget, **limits, **options)
+                stats[mode]['seconds'] += time.perf_counter() - started
+                stats[mode]['labels'] += result.labels
+                stats[mode]['feasible'] += result.feasible
+                stats[mode]['complete'] += result.complete
+                if result.best is not None:
+                    stats[mode]['gap'] += result.best.latency / fastest.latency - 1
+        for mode, totals in stats.items():
+            print(f"  {mode:>28}: {done} queries, mean {1000 * totals['seconds'] / max(1, done):,.0f}ms, "
+                  f"mean labels {totals['labels'] // max(1, done):,}, feasible {totals['feasible']}, "
+                  f"complete {totals['complete']}, "
+                  f"latency vs unconstrained +{totals['gap'] / max(1, totals['feasible']):.1%}")
+
+
+if __name__ == '__main__':
+    benchmark_route_solver()
@@ -2,7 +2,13 @@
 Code Completion Examples
 """
 
-from typing import List, TypeVar, Dict, Any
+import multiprocessing
+import os
+import pickle
+import tempfile
+from collections import Counter
+from itertools import chain
+from typing import List, TypeVar, Dict, Any, Iterable, Iterator, Optional, Tuple
 
 T = TypeVar('T')
 Number = TypeVar('Number', int, float)
@@ -13,12 +19,140 @@ def find_max(arr: List[Number]) -> Number:
     pass
 
 def find_duplicates(arr: List[T]) -> List[T]:
-    # your implementation here
-
-    pass
+    # Count in one O(n) hash pass; Counter keeps keys in first-occurrence order
+    return [item for item, count in Counter(arr).items() if count > 1]
 
 
 def group_by_key(items: List[Dict[str, Any]], key: str) -> Dict[str, List[Dict[str, Any]]]:
-    # your implementation here
-    pass
+    # Items without the key are skipped; groups keep input order
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        if key in item:
+            groups.setdefault(item[key], []).append(item)
+    return groups
+
+
+# Grouping engine with aggregates pushed into the grouping pass
+# aggregates maps an output name to (function, field), for example
+#   {'orders': ('count', None), 'revenue': ('sum', 'amount'), 'ids': ('list', 'id')}
+# Functions: count, sum, min, max and list; ('list', None) collects whole items.
+AGGREGATES = ('count', 'sum', 'min', 'max', 'list')
+
+
+class _MissingType:
+    """Placeholder for a field a row does not have; pickles as the module singleton."""
+    def __reduce__(self):
+        return '_MISSING'
+
+    def __repr__(self) -> str:
+        return '_MISSING'
+
+
+_MISSING = _MissingType()
+
+
+def _aggregate_rows(rows: Iterable[tuple], functions: List[str]) -> Dict[Any, list]:
+    # rows are (group key, value for aggregate 0, value for aggregate 1, ...)
+    groups: Dict[Any, list] = {}
+    for row in rows:
+        state = groups.get(row[0])
+        if state is None:
+            state = groups[row[0]] = [0 if f in ('count', 'sum') else [] if f == 'list' else _MISSING
+                                      for f in functions]
+        for i, function in enumerate(functions):
+            value = row[i + 1]
+            if function == 'count':
+                state[i] += 1
+            elif value is _MISSING or (value is None and function != 'list'):
+                continue
+            elif function == 'sum':
+                state[i] += value
+            elif function == 'list':
+                state[i].append(value)
+            elif state[i] is _MISSING or (value < state[i] if function == 'min' else value > state[i]):
+                state[i] = value
+    return groups
+
+
+def _spilled_rows(path: str) -> Iterator[tuple]:
+    # One pickled batch in memory at a time
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch = pickle.load(f)
+            except EOFError:
+                return
+            yield from batch
+
+
+def _aggregate_partition(task: Tuple[Optional[str], list, List[str]]) -> Dict[Any, list]:
+    path, rows, functions = task
+    if path is None:
+        return _aggregate_rows(rows, functions)
+    return _aggregate_rows(chain(_spilled_rows(path), rows), functions)
+
+
+def group_aggregate(
+    items: Iterable[Dict[str, Any]],
+    key: str,
+    aggregates: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
+    partitions: int = 16,
+    processes: Optional[int] = None,
+    max_rows_in_memory: int = 1_000_000,
+    spill_dir: Optional[str] = None,
+) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    """
+    Groups items by item[key] and computes aggregates while grouping, yielding
+    (group key, {name: value}) pairs. Items without the key are skipped.
+    - Rows are hash-partitioned by group key; every group lives in exactly one partition
+    - Only the group key and the aggregated fields are kept per row
+    - Partitions are aggregated in-process, or on a pool of processes workers
+    - Groups are yielded as soon as their partition is done
+    - Once more than max_rows_in_memory rows are buffered, partitions spill to disk,
+      so memory is bounded by partition size rather than input size
+    sum, min and max ignore rows whose field is missing or None; min and max are None
+    for a group where no row has a value.
+    """
+    aggregates = aggregates or {'count': ('count', None)}
+    for function, _ in aggregates.values():
+        if function not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {function}")
+    names = list(aggregates)
+    functions = [function for function, _ in aggregates.values()]
+    fields = [field for _, field in aggregates.values()]
+
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        buffers: List[list] = [[] for _ in range(partitions)]
+        paths: List[Optional[str]] = [None] * partitions
+        buffered = 0
+        for item in items:
+            if key not in item:
+                continue
+            group = item[key]
+            row = (group,) + tuple(item if field is None else item.get(field, _MISSING) for field in fields)
+            buffers[hash(group) % partitions].append(row)
+            buffered += 1
+            if buffered >= max_rows_in_memory:
+                for index, buffer in enumerate(buffers):
+                    if buffer:
+                        paths[index] = paths[index] or os.path.join(directory, f'partition-{index}.pkl')
+                        with open(paths[index], 'ab') as f:
+                            pickle.dump(buffer, f, pickle.HIGHEST_PROTOCOL)
+                        buffers[index] = []
+                buffered = 0
+
+        tasks = [(path, buffer, functions) for path, buffer in zip(paths, buffers) if path or buffer]
+        del buffers
+        if processes and processes > 1 and len(tasks) > 1:
+            with multiprocessing.Pool(min(processes, len(tasks))) as pool:
+                for groups in pool.imap_unordered(_aggregate_partition, tasks):
+                    yield from _finish_groups(groups, names)
+        else:
+            while tasks:
+                yield from _finish_groups(_aggregate_partition(tasks.pop(0)), names)
+
+
+def _finish_groups(groups: Dict[Any, list], names: List[str]) -> Iterator[Tuple[Any, Dict[str, Any]]]:
+    for group, state in groups.items():
+        yield group, {name: None if value is _MISSING else value for name, value in zip(names, state)}
 
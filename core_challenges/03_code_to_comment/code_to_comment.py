@@ -1,13 +1,262 @@
+import multiprocessing
+import time
+from array import array
+from collections import deque
+from itertools import compress
+from math import isqrt
+
 
 def find_primes(max):
+    return list(iter_primes(2, max + 1))
+
+
+# Segmented sieve engine
+# Only odd numbers are stored: flag i of a segment starting at odd lo stands for lo + 2 * i.
+# A segment of SEGMENT_SIZE flags (256 KiB) stays in L2 cache while it is sieved.
+SEGMENT_SIZE = 1 << 18
+# Odd flags per process-pool task; each task sieves its span one segment at a time
+TASK_SIZE = SEGMENT_SIZE * 16
+# Largest limit the cached bit-packed sieve grows to (2**30 / 16 bytes = 64 MiB)
+CACHE_LIMIT = 1 << 30
+
+_ZEROS = bytes(SEGMENT_SIZE)
+_base_primes = []
+_base_limit = 0
+
+
+def _odd_primes_upto(limit):
+    """Odd primes <= limit, from a plain odd-only sieve; reused while limit does not grow."""
+    global _base_primes, _base_limit
+    if limit > _base_limit:
+        limit = max(limit, 2 * _base_limit, 1 << 10)
+        n = limit // 2 + 1
+        flags = bytearray(b'\x01') * n
+        flags[0] = 0
+        for i in range(1, (isqrt(2 * n - 1) - 1) // 2 + 1):
+            if flags[i]:
+                p = 2 * i + 1
+                flags[p * p // 2::p] = bytes(len(range(p * p // 2, n, p)))
+        _base_primes = list(compress(range(1, 2 * n, 2), flags))
+        _base_limit = 2 * n - 1
+    return _base_primes
+
+
+def _sieve_segment(lo, n):
+    """Flags for the n odd numbers lo, lo + 2, ..., lo + 2 * (n - 1); lo is odd."""
+    global _ZEROS
+    if n > len(_ZEROS):
+        _ZEROS = bytes(n)
+    hi = lo + 2 * n
+    flags = bytearray(b'\x01') * n
+    for p in _odd_primes_upto(isqrt(hi)):
+        start = p * p
+        if start >= hi:
+            break
+        if start < lo:
+            # First odd multiple of p at or above lo
+            start = (lo + p - 1) // p * p
+            if not start & 1:
+                start += p
+        i = (start - lo) >> 1
+        if i < n:
+            flags[i::p] = _ZEROS[:(n - 1 - i) // p + 1]
+    if lo == 1:
+        flags[0] = 0
+    return flags
+
+
+def _sieve_span(task):
+    lo, n, segment_size = task
+    if n <= segment_size:
+        return _sieve_segment(lo, n)
+    flags = bytearray()
+    for offset in range(0, n, segment_size):
+        flags += _sieve_segment(lo + 2 * offset, min(segment_size, n - offset))
+    return flags
+
+
+def _spans(lo, stop, size):
+    # (lo, n) pairs covering the odd numbers from lo up to stop (unbounded when stop is None)
+    while stop is None or lo < stop:
+        n = size if stop is None else min(size, (stop - lo + 1) // 2)
+        yield lo, n
+        lo += 2 * n
+
+
+def _iter_flags(lo, stop, segment_size=SEGMENT_SIZE, processes=None):
+    """
+    Yields (lo, flags) for consecutive segments of odd numbers from lo to stop.
+    - Sequential mode sieves one L2-sized segment at a time
+    - With processes > 1, disjoint spans are sieved on a process pool; at most
+      2 * processes spans are in flight, so memory stays bounded even when stop is None
+    """
+    if not processes or processes <= 1:
+        for span in _spans(lo, stop, segment_size):
+            yield span[0], _sieve_segment(*span)
+        return
+    spans = _spans(lo, stop, max(TASK_SIZE, segment_size))
+    with multiprocessing.Pool(processes) as pool:
+        pending = deque()
+        for span_lo, n in spans:
+            pending.append((span_lo, pool.apply_async(_sieve_span, ((span_lo, n, segment_size),))))
+            if len(pending) >= 2 * processes:
+                span_lo, result = pending.popleft()
+                yield span_lo, result.get()
+        while pending:
+            span_lo, result = pending.popleft()
+            yield span_lo, result.get()
+
+
+def iter_primes(start=2, stop=None, segment_size=SEGMENT_SIZE, processes=None):
+    """
+    Lazily yields the primes p with start <= p < stop, in increasing order.
+    stop=None yields primes forever; memory is bounded by the segment size.
+    """
+    if stop is not None and stop <= start:
+        return
+    if start <= 2 and (stop is None or stop > 2):
+        yield 2
+    lo = max(start, 3) | 1
+    for span_lo, flags in _iter_flags(lo, stop, segment_size, processes):
+        yield from compress(range(span_lo, span_lo + 2 * len(flags), 2), flags)
+
+
+def count_primes(stop, segment_size=SEGMENT_SIZE, processes=None):
+    """Number of primes below stop, counted segment by segment without materialising them."""
+    if stop <= 2:
+        return 0
+    return 1 + sum(flags.count(1) for _, flags in _iter_flags(3, stop, segment_size, processes))
+
+
+def _pack_bits(flags):
+    # Bit k of packed byte j is flag 8 * j + k; flags are 0/1 so shifted bytes never carry
+    value = 0
+    for k in range(8):
+        value |= int.from_bytes(flags[k::8], 'little') << k
+    return value.to_bytes((len(flags) + 7) // 8, 'little')
+
+
+class PrimeTable:
+    """
+    Bit-packed odd-only sieve of [0, limit): bit i of bits stands for 2 * i + 1.
+    - 1/16 byte per integer, so the table for 10**9 takes about 62 MiB
+    - counts holds the running prime count at every BLOCK bytes for O(BLOCK) prime_count
+    """
+    BLOCK = 4096
+
+    def __init__(self, limit, segment_size=SEGMENT_SIZE, processes=None):
+        # Segments must cover whole bytes so their packed bits concatenate
+        segment_size = max(8, segment_size - segment_size % 8)
+        self.limit = limit
+        self.bits = b''.join(_pack_bits(flags) for _, flags in _iter_flags(1, limit, segment_size, processes))
+        self.counts = array('Q', [0])
+        total = 0
+        for offset in range(0, len(self.bits), self.BLOCK):
+            total += int.from_bytes(self.bits[offset:offset + self.BLOCK], 'little').bit_count()
+            self.counts.append(total)
+
+    def is_prime(self, n):
+        if n < 3:
+            return n == 2
+        return bool(n & 1) and bool(self.bits[n >> 4] >> ((n >> 1) & 7) & 1)
+
+    def prime_count(self, n):
+        """Number of primes <= n."""
+        if n < 2:
+            return 0
+        m = (n + 1) // 2  # odd numbers <= n
+        byte, bit = divmod(m, 8)
+        block = byte // self.BLOCK
+        count = self.counts[block] + int.from_bytes(self.bits[block * self.BLOCK:byte], 'little').bit_count()
+        if bit:
+            count += (self.bits[byte] & ((1 << bit) - 1)).bit_count()
+        # 2 is prime and 1 is not; the bit for 1 is always clear
+        return count + 1
+
+
+_table = None
+
+
+def prime_table(limit):
+    """Shared PrimeTable covering [0, limit); grows geometrically up to CACHE_LIMIT."""
+    global _table
+    if _table is None or _table.limit < limit:
+        if limit > CACHE_LIMIT:
+            raise ValueError(f"limit {limit} is above CACHE_LIMIT ({CACHE_LIMIT})")
+        grown = 1 << 16 if _table is None else 2 * _table.limit
+        _table = PrimeTable(min(max(limit, grown), CACHE_LIMIT))
+    return _table
+
+
+# Bases 2..37 make Miller-Rabin exact for n < 3.3 * 10**24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+
+def _miller_rabin(n):
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in _WITNESSES:
+        if a % n == 0:
+            continue
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_prime(n):
+    """Reads the cached sieve below CACHE_LIMIT; larger n use Miller-Rabin."""
+    if n < CACHE_LIMIT:
+        return prime_table(n + 1).is_prime(n)
+    if not n & 1 or any(n % p == 0 for p in _WITNESSES):
+        return False
+    return _miller_rabin(n)
+
+
+def prime_count(n):
+    """Number of primes <= n; read from the cached sieve below CACHE_LIMIT, sieved on the fly above."""
+    if n < CACHE_LIMIT:
+        return prime_table(n + 1).prime_count(n)
+    return count_primes(n + 1)
+
+
+def _naive_primes(max):
     sieve = [True] * (max + 1)
     sieve[0] = sieve[1] = False
-    
     for i in range(2, int(max ** 0.5) + 1):
         if sieve[i]:
             for j in range(i * i, max + 1, i):
                 sieve[j] = False
-    
     return [num for num, is_prime in enumerate(sieve) if is_prime]
 
-print(find_primes(30))
\ No newline at end of file
+
+def benchmark_sieve(limits=(10 ** 7, 10 ** 8, 10 ** 9), processes=None):
+    """
+    Times counting the primes below each limit with the segmented sieve,
+    sequentially and on a process pool, and the list-of-booleans sieve where it fits
+    """
+    processes = processes or multiprocessing.cpu_count()
+    print(f"{'limit':>14} {'mode':>18} {'primes':>12} {'seconds':>9}")
+    for limit in limits:
+        runs = [('segmented', lambda: count_primes(limit))]
+        if processes > 1:
+            runs.append((f'parallel x{processes}', lambda: count_primes(limit, processes=processes)))
+        if limit <= 10 ** 7:
+            runs.append(('list of booleans', lambda: len(_naive_primes(limit - 1))))
+        for mode, run in runs:
+            started = time.perf_counter()
+            count = run()
+            print(f"{limit:>14,} {mode:>18} {count:>12,} {time.perf_counter() - started:>9.2f}")
+
+
+if __name__ == '__main__':
+    print(find_primes(30))
+    benchmark_sieve()
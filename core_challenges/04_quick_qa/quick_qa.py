@@ -1,15 +1,23 @@
+import array
+import hashlib
+import heapq
+import math
+import os
+import pickle
+import tempfile
+import time
+from collections import Counter
+from itertools import chain, islice, repeat
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
 # Example 1: Code Explanation Question
 def process_data(items: list) -> dict:
     """
     Q: What does this function do? How can it be improved?
+    A: It counts how often each item occurs. Counter does the same counting loop in C;
+    see the counting section below for batched, approximate and mergeable counters.
     """
-    result = {}
-    for item in items:
-        if item in result:
-            result[item] += 1
-        else:
-            result[item] = 1
-    return result
+    return dict(Counter(items))
 
 # Example 2: Debugging Question
 def calculate_average(numbers: list) -> float:
@@ -20,10 +28,34 @@ def calculate_average(numbers: list) -> float:
     return total / len(numbers)
 
 # Example 3: Performance Question
-def find_duplicates(array: list) -> list:
+def find_duplicates(array: list, method: str = 'auto') -> list:
     """
     Q: How can we optimize this function for better performance?
+    A: Count occurrences in a hash table in one O(n) pass instead of comparing every pair.
+    Returns each value that occurs more than once, in order of first occurrence.
+    method: 'hash', 'sort' (unhashable but totally ordered items), 'pairwise', or
+    'auto', which tries them in that order.
     """
+    if method == 'hash':
+        return _duplicates_by_hash(array)
+    if method == 'sort':
+        return _duplicates_by_sort(array)
+    if method == 'pairwise':
+        return _duplicates_pairwise(array)
+    if method != 'auto':
+        raise ValueError(f"Unknown method: {method}")
+    try:
+        return _duplicates_by_hash(array)
+    except TypeError:
+        pass
+    try:
+        # Raises TypeError for unorderable items and for orders that are only partial
+        return _duplicates_by_sort(array)
+    except TypeError:
+        return _duplicates_pairwise(array)
+
+def _duplicates_pairwise(array: list) -> list:
+    """The original O(n^2) comparison; only needed for unhashable, unorderable items."""
     duplicates = []
     for i in range(len(array)):
         for j in range(i + 1, len(array)):
@@ -46,4 +78,437 @@ class DataProcessor:
     
     def process(self):
         # Some processing logic here
-        self.processed = True 
\ No newline at end of file
+        self.processed = True 
+
+# Duplicate detection at scale
+def _duplicates_by_hash(items: Iterable) -> list:
+    # Counter keeps first-seen keys in insertion order, matching the pairwise result
+    return [item for item, count in Counter(items).items() if count > 1]
+
+_TOTALLY_ORDERED = (int, str, bytes)
+
+def _totally_ordered(item: Any) -> bool:
+    """True if item's < is a total order: numbers other than NaN, strings, or sequences of them."""
+    if isinstance(item, _TOTALLY_ORDERED):
+        return True
+    if isinstance(item, float):
+        return item == item
+    if isinstance(item, (list, tuple)):
+        return all(_totally_ordered(element) for element in item)
+    return False
+
+def _duplicates_by_sort(array: list) -> list:
+    """
+    O(n log n): sorts indices by item so equal items become adjacent runs.
+    Items such as sets are only partially ordered, so equal ones may not end up
+    adjacent; for those, neighbours must be equal or strictly increasing,
+    otherwise TypeError is raised.
+    """
+    order = sorted(range(len(array)), key=array.__getitem__)
+    if not all(_totally_ordered(item) for item in array):
+        for previous, current in zip(order, order[1:]):
+            if not (array[previous] == array[current] or array[previous] < array[current]):
+                raise TypeError("items are not totally ordered")
+    firsts = []
+    run_start = 0
+    for position in range(1, len(order) + 1):
+        if position == len(order) or array[order[position]] != array[order[run_start]]:
+            if position - run_start > 1:
+                firsts.append(min(order[run_start:position]))
+            run_start = position
+    return [array[index] for index in sorted(firsts)]
+
+# Partitions that still hold too many distinct items are re-split at most this many times
+_MAX_SPILL_DEPTH = 8
+
+def find_duplicates_streaming(
+    items: Iterable,
+    max_items_in_memory: int = 1_000_000,
+    partitions: int = 64,
+    spill_dir: Optional[str] = None,
+) -> Iterator:
+    """
+    Yields each duplicated value once, using bounded memory for inputs larger than RAM.
+    Up to max_items_in_memory distinct items are counted in memory. Past that, items
+    are hash-partitioned into pickled spill files, and each partition is deduplicated
+    on its own; a partition that is still over the budget is re-split with a
+    different hash. Equal items always land in the same partition. Items must be
+    hashable and picklable. Once the input spills, results come out in partition
+    order, not first-occurrence order.
+    """
+    if max_items_in_memory < 1 or partitions < 2:
+        raise ValueError("max_items_in_memory must be positive and partitions at least 2")
+    with tempfile.TemporaryDirectory(dir=spill_dir) as directory:
+        yield from _spilled_duplicates(
+            ((item, 1) for item in items), max_items_in_memory, partitions, directory, 0
+        )
+
+def _spilled_duplicates(
+    pairs: Iterator[Tuple[Any, int]], max_items: int, partitions: int, directory: str, depth: int
+) -> Iterator:
+    """Counts (item, count) pairs in memory, spilling to partitions when over max_items."""
+    pairs = iter(pairs)
+    counts = Counter()
+    for item, count in pairs:
+        counts[item] += count
+        if len(counts) > max_items and depth < _MAX_SPILL_DEPTH:
+            break
+    else:
+        yield from (item for item, count in counts.items() if count > 1)
+        return
+
+    with tempfile.TemporaryDirectory(dir=directory) as level:
+        paths = [os.path.join(level, f'partition-{i}.pkl') for i in range(partitions)]
+        files = [open(path, 'wb') for path in paths]
+        buffers: List[list] = [[] for _ in range(partitions)]
+        batch_size = max(max_items // partitions, 1)
+
+        def spill(item: Any, count: int) -> None:
+            # Salting with depth sends a re-split partition's items to new partitions
+            index = hash((depth, item)) % partitions
+            buffer = buffers[index]
+            buffer.append((item, count))
+            if len(buffer) >= batch_size:
+                pickle.dump(buffer, files[index], pickle.HIGHEST_PROTOCOL)
+                buffer.clear()
+
+        try:
+            for item, count in counts.items():
+                spill(item, count)
+            counts.clear()
+            for item, count in pairs:
+                spill(item, count)
+            for buffer, f in zip(buffers, files):
+                if buffer:
+                    pickle.dump(buffer, f, pickle.HIGHEST_PROTOCOL)
+        finally:
+            for f in files:
+                f.close()
+
+        for path in paths:
+            yield from _spilled_duplicates(_read_spill(path), max_items, partitions, level, depth + 1)
+
+def _read_spill(path: str) -> Iterator[Tuple[Any, int]]:
+    """Yields the (item, count) pairs of one spill file, then deletes it."""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                break
+    os.unlink(path)
+
+def _stable_hash(item: Any) -> Tuple[int, int]:
+    """
+    Two 64-bit hashes of item for double hashing. Unlike hash(), the result is the same
+    in every process, so sketches built on different shards can be merged.
+    """
+    kind = type(item)
+    if kind is str:
+        data = item.encode()
+    elif kind is int:
+        data = repr(item).encode()
+    else:
+        # Equal numbers (1, 1.0, True) must hash alike, as they do for dict keys
+        if isinstance(item, (int, float)) and item == item and abs(item) != math.inf and item == int(item):
+            item = int(item)
+        data = repr(item).encode()
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+class BloomFilter:
+    """
+    Probabilistic set membership with no false negatives.
+    Sized for capacity items at the given false-positive rate, using
+    k bit positions derived from one BLAKE2b digest by double hashing.
+    """
+    def __init__(self, capacity: int, false_positive_rate: float = 0.01):
+        if capacity < 1 or not 0 < false_positive_rate < 1:
+            raise ValueError("capacity must be positive and false_positive_rate in (0, 1)")
+        self.num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: Any) -> range:
+        h1, h2 = _stable_hash(item)
+        return range(h1, h1 + self.num_hashes * h2, h2)
+
+    def add(self, item: Any) -> bool:
+        """Adds item; returns True if it was (probably) already present."""
+        present = True
+        bits = self.bits
+        num_bits = self.num_bits
+        for position in self._positions(item):
+            position %= num_bits
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, item: Any) -> bool:
+        bits, num_bits = self.bits, self.num_bits
+        return all(bits[p % num_bits >> 3] & (1 << (p % num_bits & 7)) for p in self._positions(item))
+
+def find_duplicates_approximate(items: Iterable, capacity: int, false_positive_rate: float = 0.01) -> Iterator:
+    """
+    Yields values that were (probably) seen earlier in the stream, in fixed memory.
+    Every true duplicate is reported; with probability about false_positive_rate a
+    unique value is reported too. Each value is reported at most once, except that a
+    false positive in the "already reported" filter can suppress a later report.
+    """
+    seen = BloomFilter(capacity, false_positive_rate)
+    reported = BloomFilter(capacity, false_positive_rate)
+    for item in items:
+        if seen.add(item) and not reported.add(item):
+            yield item
+
+def benchmark_find_duplicates(sizes=(1_000, 100_000, 1_000_000), duplicate_ratios=(0.0, 0.1, 0.5)) -> None:
+    """Items/sec for each duplicate-detection mode; the pairwise baseline only runs on small inputs."""
+    modes = [
+        ('pairwise', lambda data: _duplicates_pairwise(data)),
+        ('hash', lambda data: find_duplicates(data, 'hash')),
+        ('sort', lambda data: find_duplicates(data, 'sort')),
+        ('streaming', lambda data: list(find_duplicates_streaming(data, max_items_in_memory=len(data) // 4 + 1))),
+        ('bloom', lambda data: list(find_duplicates_approximate(data, capacity=len(data)))),
+    ]
+    print(f"{'size':>10}{'dup ratio':>11}" + ''.join(f"{name:>14}" for name, _ in modes))
+    for size in sizes:
+        for ratio in duplicate_ratios:
+            unique = max(int(size * (1 - ratio)), 1)
+            data = [f'id-{i % unique}' for i in range(size)]
+            row = f"{size:>10,}{ratio:>11.0%}"
+            for name, run in modes:
+                if name == 'pairwise' and size > 5_000:
+                    row += f"{'-':>14}"
+                    continue
+                start = time.perf_counter()
+                run(data)
+                row += f"{size / (time.perf_counter() - start):>14,.0f}"
+            print(row)
+
+
+# Counting at scale
+def _batches(items: Iterable, batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+class ExactCounter:
+    """
+    Exact item counts, fed from any iterator in batches.
+    Each batch is counted by Counter in C; merging adds another counter's counts,
+    so shards counted in separate processes can be pickled back and combined.
+    """
+    def __init__(self):
+        self.counts = Counter()
+        self.total = 0
+
+    def update(self, items: Iterable, batch_size: int = 65_536) -> None:
+        for batch in _batches(items, batch_size):
+            self.counts.update(batch)
+            self.total += len(batch)
+
+    def merge(self, other: 'ExactCounter') -> None:
+        self.counts.update(other.counts)
+        self.total += other.total
+
+    def estimate(self, item: Any) -> int:
+        return self.counts[item]
+
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        return self.counts.most_common(k)
+
+class CountMinSketch:
+    """
+    Approximate counts in fixed memory: depth rows of width counters.
+    Estimates never undercount; with probability 1 - exp(-depth) they overcount
+    by at most e / width * total. The k most frequent items seen so far are
+    tracked alongside the table. Sketches of the same shape merge by adding tables.
+    """
+    def __init__(self, width: int = 2 ** 16, depth: int = 5, k: int = 100):
+        self.width = width
+        self.depth = depth
+        self.k = k
+        self.table = array.array('q', bytes(8 * width * depth))
+        self.total = 0
+        self.heavy: Dict[Any, int] = {}
+        self._floor = 0
+
+    def _cells(self, item: Any) -> List[int]:
+        h1, h2 = _stable_hash(item)
+        width = self.width
+        return [row * width + (h1 + row * h2) % width for row in range(self.depth)]
+
+    def _add(self, item: Any, count: int) -> int:
+        table = self.table
+        width = self.width
+        h1, h2 = _stable_hash(item)
+        estimate = None
+        for offset in range(0, width * self.depth, width):
+            cell = offset + h1 % width
+            h1 += h2
+            value = table[cell] + count
+            table[cell] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        return estimate
+
+    def update(self, items: Iterable, batch_size: int = 65_536) -> None:
+        # Pre-aggregating each batch hashes every distinct item once per batch, not once per occurrence
+        for batch in _batches(items, batch_size):
+            for item, count in Counter(batch).items():
+                self._track(item, self._add(item, count))
+            self.total += len(batch)
+
+    def _track(self, item: Any, estimate: int) -> None:
+        heavy = self.heavy
+        if item in heavy or len(heavy) < self.k:
+            heavy[item] = estimate
+            return
+        # _floor is a lower bound on the smallest tracked estimate, so most items stop here
+        if estimate <= self._floor:
+            return
+        smallest = min(heavy, key=heavy.get)
+        if estimate > heavy[smallest]:
+            del heavy[smallest]
+            heavy[item] = estimate
+        self._floor = min(heavy.values())
+
+    def estimate(self, item: Any) -> int:
+        table = self.table
+        return min(table[cell] for cell in self._cells(item))
+
+    def merge(self, other: 'CountMinSketch') -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches with different shapes")
+        table = self.table
+        for cell, value in enumerate(other.table):
+            if value:
+                table[cell] += value
+        self.total += other.total
+        candidates = set(self.heavy) | set(other.heavy)
+        self.heavy = dict(heapq.nlargest(self.k, ((item, self.estimate(item)) for item in candidates),
+                                         key=lambda pair: pair[1]))
+        self._floor = min(self.heavy.values(), default=0)
+
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        return heapq.nlargest(k, self.heavy.items(), key=lambda pair: pair[1])
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary with a fixed number of counters.
+    Every item with true frequency above total / capacity is kept. Each count
+    overestimates by at most the item's recorded error. Summaries merge by
+    adding counts (an item missing from a full summary gets that summary's
+    minimum as extra error) and keeping the largest counters.
+    """
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.errors: Dict[Any, int] = {}
+        self.total = 0
+        self._heap: List[Tuple[int, int, Any]] = []
+        self._sequence = 0
+
+    def _push(self, item: Any) -> None:
+        # Lazy min-heap: stale entries are skipped when they surface
+        self._sequence += 1
+        heapq.heappush(self._heap, (self.counts[item], self._sequence, item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, i, item) for i, (item, count) in enumerate(self.counts.items())]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Any, int]:
+        while True:
+            count, _, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return item, count
+
+    def _add(self, item: Any, count: int) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += count
+        elif len(counts) < self.capacity:
+            counts[item] = count
+            self.errors[item] = 0
+        else:
+            evicted, minimum = self._pop_min()
+            del counts[evicted]
+            del self.errors[evicted]
+            counts[item] = minimum + count
+            self.errors[item] = minimum
+        self._push(item)
+
+    def update(self, items: Iterable, batch_size: int = 65_536) -> None:
+        for batch in _batches(items, batch_size):
+            for item, count in Counter(batch).items():
+                self._add(item, count)
+            self.total += len(batch)
+
+    def _floor(self) -> int:
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def estimate(self, item: Any) -> int:
+        return self.counts.get(item, self._floor())
+
+    def merge(self, other: 'SpaceSaving') -> None:
+        floor, other_floor = self._floor(), other._floor()
+        counts: Dict[Any, int] = {}
+        errors: Dict[Any, int] = {}
+        for item in set(self.counts) | set(other.counts):
+            counts[item] = self.counts.get(item, floor) + other.counts.get(item, other_floor)
+            errors[item] = (self.errors.get(item, floor) + other.errors.get(item, other_floor))
+        kept = heapq.nlargest(self.capacity, counts, key=counts.get)
+        self.counts = {item: counts[item] for item in kept}
+        self.errors = {item: errors[item] for item in kept}
+        self.total += other.total
+        self._heap = [(count, i, item) for i, (item, count) in enumerate(self.counts.items())]
+        heapq.heapify(self._heap)
+        self._sequence = len(self._heap)
+
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        return heapq.nlargest(k, self.counts.items(), key=lambda pair: pair[1])
+
+def _zipf_pool(size: int = 1_000_000, distinct: int = 1_000_000, seed: int = 0) -> List[int]:
+    """Item IDs: half from a skewed Zipf-like head, half uniform over distinct IDs (the long tail)."""
+    import random
+    rng = random.Random(seed)
+    return [int(rng.paretovariate(1.1)) % distinct if i % 2 else rng.randrange(distinct) for i in range(size)]
+
+def _run_counter_benchmark(mode: str, size: int, k: int, conn) -> None:
+    import resource
+    make = {
+        'exact': ExactCounter,
+        'count-min': lambda: CountMinSketch(k=k),
+        'space-saving': lambda: SpaceSaving(capacity=10 * k),
+    }[mode]
+    pool = _zipf_pool()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    counter = make()
+    start = time.perf_counter()
+    counter.update(islice(chain.from_iterable(repeat(pool)), size))
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    conn.send((size / elapsed, (peak - baseline) / 1024))
+    conn.close()
+
+def benchmark_counters(sizes=(10_000_000, 100_000_000), k: int = 100) -> None:
+    """
+    Items/sec and memory growth (peak RSS over the input pool) for the exact and
+    approximate counters, each run in a fresh process.
+    """
+    import multiprocessing
+
+    print(f"{'items':>13}  {'mode':<14}{'items/sec':>14}{'memory MB':>11}")
+    for size in sizes:
+        for mode in ('exact', 'count-min', 'space-saving'):
+            parent, child = multiprocessing.Pipe(duplex=False)
+            process = multiprocessing.Process(target=_run_counter_benchmark, args=(mode, size, k, child))
+            process.start()
+            rate, memory = parent.recv()
+            process.join()
+            print(f"{size:>13,}  {mode:<14}{rate:>14,.0f}{memory:>11.1f}")
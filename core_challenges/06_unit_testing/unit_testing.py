@@ -1,13 +1,40 @@
+import array
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import math
+import random
+import sqlite3
+import time
 import unittest
-from typing import List, Dict, Optional
+from collections import defaultdict
+from collections.abc import Mapping, Sized
+from typing import Any, Iterable, List, Dict, Optional, Sequence, Set, Tuple, Union
 from unittest.mock import Mock, patch
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; buffers and sequences fall back to builtins
+    np = None
+
 # Code to be tested
 class UserManager:
-    def __init__(self, database):
+    def __init__(self, database, stats_ttl: float = 60.0, approximate_active: bool = False):
+        """
+        stats_ttl: seconds between re-reading the total user count from the database;
+            in between, the count is maintained incrementally by add_user and remove_user.
+        approximate_active: track active users with HyperLogLog sketches instead of a set,
+            for fixed memory and sketches that merge across replicas. The active count is
+            the difference of two estimates, each within ~1% of the users ever added or
+            removed, so its relative error is unbounded once most users have been removed.
+        """
         self.db = database
-        self.active_users = set()
+        self.active_users = ApproximateActiveSet() if approximate_active else set()
+        self.stats_ttl = stats_ttl
+        self._total_users: Optional[int] = None
+        self._total_loaded_at = 0.0
 
     def add_user(self, username: str, email: str) -> Dict:
         """
@@ -34,8 +61,27 @@ class UserManager:
         user_id = self.db.insert('users', user)
         user['id'] = user_id
         self.active_users.add(username)
+        if self._total_users is not None:
+            self._total_users += 1
         return user
 
+    def deactivate_user(self, username: str) -> None:
+        """Marks a user inactive in the database and in the active-user tracking."""
+        self.db.update('users', {'username': username}, {'active': False})
+        self.active_users.discard(username)
+
+    def remove_user(self, username: str) -> None:
+        """Deletes a user and keeps the cached statistics current."""
+        existed = self._user_exists(username)
+        self.db.delete('users', {'username': username})
+        self.active_users.discard(username)
+        if existed and self._total_users is not None:
+            self._total_users -= 1
+
+    def invalidate_stats(self) -> None:
+        """Forces the next get_user_stats call to re-read the total from the database."""
+        self._total_users = None
+
     def _is_valid_email(self, email: str) -> bool:
         return '@' in email and '.' in email.split('@')[1]
 
@@ -45,12 +91,289 @@ class UserManager:
     def get_user_stats(self) -> Dict:
         """
         Calculates user statistics.
+        The total is read from the database at most once per stats_ttl seconds.
         Write tests that:
         - Verify correct statistics calculation
         - Handle empty user database
         - Test performance with large datasets
         """
-        total_users = self.db.count('users')
+        now = time.monotonic()
+        if self._total_users is None or now - self._total_loaded_at >= self.stats_ttl:
+            self._total_users = self.db.count('users')
+            self._total_loaded_at = now
+        total_users = self._total_users
+        active_users = len(self.active_users)
+        return {
+            'total_users': total_users,
+            'active_users': active_users,
+            'inactive_users': total_users - active_users
+        }
+
+# Approximate distinct counting for UserManager(approximate_active=True)
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch with 2**precision one-byte registers.
+    Values are hashed with BLAKE2b rather than hash(), so sketches built in
+    different processes can be merged. The estimate is kept up to date on
+    every add, so len() is O(1).
+    """
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._inverse_sum = float(len(self.registers))
+        self._zeros = len(self.registers)
+
+    def add(self, value: Any) -> None:
+        digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        remainder = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        self._set(index, rank)
+
+    def _set(self, index: int, rank: int) -> None:
+        current = self.registers[index]
+        if rank > current:
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -current
+            if current == 0:
+                self._zeros -= 1
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Folds another sketch of the same precision into this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        for index, rank in enumerate(other.registers):
+            self._set(index, rank)
+
+    def __len__(self) -> int:
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / self._inverse_sum
+        if estimate <= 2.5 * m and self._zeros:
+            estimate = m * math.log(m / self._zeros)
+        return round(estimate)
+
+class ApproximateActiveSet:
+    """
+    Set-like active-user tracking in fixed memory: one sketch of activated users and
+    one of deactivated users. Assumes a deactivated user is not activated again.
+    len() subtracts the two estimates, so its error scales with the number of users
+    ever added, not with the active count.
+    """
+    def __init__(self, precision: int = 14):
+        self.added = HyperLogLog(precision)
+        self.removed = HyperLogLog(precision)
+
+    def add(self, username: str) -> None:
+        self.added.add(username)
+
+    def discard(self, username: str) -> None:
+        self.removed.add(username)
+
+    def merge(self, other: 'ApproximateActiveSet') -> None:
+        self.added.merge(other.added)
+        self.removed.merge(other.removed)
+
+    def __len__(self) -> int:
+        return max(len(self.added) - len(self.removed), 0)
+
+# Async, batched persistence for bulk user onboarding
+class ConnectionPool:
+    """
+    A fixed-size pool of database connections for asyncio code.
+    Connections are created lazily by connect() up to size, then reused.
+    Each connection must provide async exists_many(table, column, values) -> set,
+    insert_many(table, rows) -> list of ids, and count(table) -> int.
+    """
+    def __init__(self, connect, size: int = 4):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self._connect = connect
+        self._created = 0
+        self._idle: asyncio.Queue = asyncio.Queue()
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            connection = self._connect()
+        else:
+            connection = await self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put_nowait(connection)
+
+class SQLiteConnection:
+    """
+    Local stand-in for an async database driver, backed by SQLite.
+    Statements run synchronously inside the coroutines, so connections sharing
+    an in-memory database never contend for locks. The default is a named,
+    shared-cache in-memory database, so every connection a pool creates sees the
+    same tables; it lives as long as one of its connections is open. (A plain
+    ':memory:' database would be private to each connection.)
+    """
+    _MAX_PARAMETERS = 900
+
+    def __init__(self, database: str = 'file:users?mode=memory&cache=shared'):
+        uri = database.startswith('file:')
+        self.connection = sqlite3.connect(database, uri=uri, isolation_level=None)
+
+    def execute_script(self, script: str) -> None:
+        self.connection.executescript(script)
+
+    async def exists_many(self, table: str, column: str, values: Sequence) -> Set:
+        found = set()
+        for start in range(0, len(values), self._MAX_PARAMETERS):
+            chunk = values[start:start + self._MAX_PARAMETERS]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.connection.execute(
+                f'SELECT {column} FROM {table} WHERE {column} IN ({placeholders})', chunk)
+            found.update(row[0] for row in rows)
+        return found
+
+    async def insert_many(self, table: str, rows: List[Dict]) -> List[int]:
+        """
+        Inserts all rows with one executemany in one transaction; on error nothing is inserted.
+        Rows must not set the rowid: SQLite then gives each new row the largest rowid
+        plus one, so the ids are the run ending at last_insert_rowid().
+        """
+        columns = list(rows[0])
+        statement = f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+        parameters = [[v.isoformat() if isinstance(v, datetime) else v for v in (row[c] for c in columns)]
+                      for row in rows]
+        cursor = self.connection.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.executemany(statement, parameters)
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        cursor.execute('COMMIT')
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    async def count(self, table: str) -> int:
+        return self.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+USERS_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    active INTEGER NOT NULL
+)
+'''
+
+class AsyncUserManager:
+    """
+    Asynchronous counterpart of UserManager for bulk onboarding.
+    add_users_bulk validates in memory, then for each batch issues one existence lookup
+    and one multi-row insert through the connection pool, with several batches in flight.
+    """
+    _is_valid_email = UserManager._is_valid_email
+
+    def __init__(self, pool: ConnectionPool, batch_size: int = 1000):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.active_users = set()
+
+    async def add_user(self, username: str, email: str) -> Dict:
+        result = await self.add_users_bulk([(username, email)])
+        if result['failed']:
+            raise ValueError(result['failed'][0][2])
+        return result['created'][0]
+
+    async def add_users_bulk(self, users: Iterable) -> Dict[str, List]:
+        """
+        Adds many users, given as (username, email) pairs or dicts with those keys.
+        Returns {'created': [user, ...], 'failed': [(index, username, reason), ...]};
+        a failing row never aborts the rest of its batch.
+        """
+        created: List[Dict] = []
+        failed: List[Tuple[int, str, str]] = []
+        seen: Set[str] = set()
+        in_flight: Set[asyncio.Task] = set()
+        batch: List[Tuple[int, Dict]] = []
+
+        async def flush() -> None:
+            if len(in_flight) >= self.pool.size:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                in_flight.difference_update(done)
+            in_flight.add(asyncio.ensure_future(self._store_batch(list(batch), created, failed)))
+            batch.clear()
+
+        for index, user in enumerate(users):
+            username, email = (user['username'], user['email']) if isinstance(user, dict) else user
+            if not self._is_valid_email(email):
+                failed.append((index, username, "Invalid email format"))
+                continue
+            if username in seen:
+                failed.append((index, username, "Username already exists"))
+                continue
+            seen.add(username)
+            batch.append((index, {'username': username, 'email': email,
+                                  'created_at': datetime.now(), 'active': True}))
+            if len(batch) >= self.batch_size:
+                await flush()
+        if batch:
+            await flush()
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+        created.sort(key=lambda user: user['id'])
+        failed.sort()
+        return {'created': created, 'failed': failed}
+
+    async def _store_batch(self, batch: List[Tuple[int, Dict]], created: List[Dict],
+                           failed: List[Tuple[int, str, str]]) -> None:
+        # Any error outside the per-row retries (pool, lookup) fails the whole batch
+        try:
+            stored, rejected = await self._insert_batch(batch)
+        except Exception as error:
+            failed.extend((index, user['username'], str(error)) for index, user in batch)
+            return
+        failed.extend(rejected)
+        created.extend(stored)
+        self.active_users.update(user['username'] for user in stored)
+
+    async def _insert_batch(self, batch: List[Tuple[int, Dict]]) -> Tuple[List[Dict], List[Tuple[int, str, str]]]:
+        rejected = []
+        async with self.pool.acquire() as connection:
+            existing = await connection.exists_many('users', 'username', [user['username'] for _, user in batch])
+            pending = []
+            for index, user in batch:
+                if user['username'] in existing:
+                    rejected.append((index, user['username'], "Username already exists"))
+                else:
+                    pending.append((index, user))
+            if not pending:
+                return [], rejected
+            try:
+                ids = await connection.insert_many('users', [user for _, user in pending])
+            except Exception:
+                # Isolate the failing rows (e.g. a concurrent insert of the same username)
+                ids = []
+                for index, user in pending:
+                    try:
+                        ids.extend(await connection.insert_many('users', [user]))
+                    except Exception as error:
+                        rejected.append((index, user['username'], str(error)))
+                        ids.append(None)
+        stored = []
+        for (_, user), user_id in zip(pending, ids):
+            if user_id is not None:
+                user['id'] = user_id
+                stored.append(user)
+        return stored, rejected
+
+    async def get_user_stats(self) -> Dict:
+        async with self.pool.acquire() as connection:
+            total_users = await connection.count('users')
         active_users = len(self.active_users)
         return {
             'total_users': total_users,
@@ -58,29 +381,755 @@ class UserManager:
             'inactive_users': total_users - active_users
         }
 
+# Statistics engine used by DataProcessor.process_numbers
+def _as_numeric(values: Any) -> Any:
+    """
+    Returns values in a form the statistics helpers can scan without copying:
+    - NumPy arrays (and any buffer when NumPy is installed) as a flat ndarray view
+    - Other buffer-protocol objects such as array.array as a 1-D memoryview
+    - Sequences unchanged; other iterables are materialized into a list
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        return values.reshape(-1)
+    if not isinstance(values, (list, tuple, str, bytes)):
+        try:
+            view = memoryview(values)
+        except TypeError:
+            pass
+        else:
+            if np is not None:
+                return np.asarray(view).reshape(-1)
+            return view if view.ndim == 1 else view.cast('B').cast(view.format)
+    if not isinstance(values, Sized):
+        values = list(values)
+    return values
+
+def _is_float_buffer(values: Any) -> bool:
+    if np is not None and isinstance(values, np.ndarray):
+        return values.dtype.kind == 'f'
+    return isinstance(values, memoryview) and values.format in ('f', 'd', 'e')
+
+def _summarize(values: Any, with_m2: bool = False) -> Tuple[int, Union[int, float], Any, Any, Optional[float]]:
+    """
+    Computes (count, sum, min, max, M2) for one block of numbers, where M2 is the
+    sum of squared deviations from the block mean (None unless with_m2 is set).
+    Integer sums are exact; float sums use math.fsum, or NumPy's pairwise summation.
+    """
+    count = len(values)
+    if np is not None and isinstance(values, np.ndarray):
+        low, high = values.min().item(), values.max().item()
+        if values.dtype.kind == 'f':
+            total = float(values.sum(dtype=np.float64))
+        elif max(abs(low), abs(high)) * count < 2 ** 63:
+            total = int(values.sum(dtype=np.int64))
+        else:
+            total = sum(values.tolist())
+        m2 = None
+        if with_m2:
+            deviations = values.astype(np.float64) - total / count
+            m2 = float(np.dot(deviations, deviations))
+        return count, total, low, high, m2
+
+    # Each builtin below is a single C loop over the data
+    if _is_float_buffer(values):
+        total = math.fsum(values)
+    else:
+        total = sum(values)
+        if isinstance(total, float):
+            total = math.fsum(values)
+    m2 = None
+    if with_m2:
+        mean = total / count
+        m2 = math.fsum((x - mean) * (x - mean) for x in values)
+    return count, total, min(values), max(values), m2
+
+def _percentile(sorted_values: Sequence, q: float) -> float:
+    """Percentile q (0-100) with linear interpolation between closest ranks."""
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return float(sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction)
+
+def _check_percentiles(percentiles: Sequence[float]) -> None:
+    for q in percentiles:
+        if not 0 <= q <= 100:
+            raise ValueError("Percentiles must be between 0 and 100")
+
+class StatsAccumulator:
+    """
+    Incrementally aggregates statistics over a stream of number chunks in constant memory.
+    Each chunk may be a list, array.array, NumPy array or other buffer; call update(chunk)
+    for each one, then result().
+    - Partial results are merged with Chan's parallel formula, so variance stays stable
+    - Percentiles are estimated from a fixed-size uniform reservoir sample
+    """
+    def __init__(self, variance: bool = False, percentiles: Sequence[float] = (),
+                 reservoir_size: int = 100_000, seed: Optional[int] = None):
+        _check_percentiles(percentiles)
+        self.variance = variance
+        self.percentiles = tuple(percentiles)
+        self.count = 0
+        self._int_total = 0
+        self._float_total = 0.0
+        self._compensation = 0.0
+        self._has_floats = False
+        self._min = None
+        self._max = None
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._reservoir: List = []
+        self._reservoir_size = reservoir_size
+        self._random = random.Random(seed)
+        self._weight = 1.0
+        self._next_sample = 0
+
+    def update(self, chunk: Any) -> None:
+        values = _as_numeric(chunk)
+        if not len(values):
+            return
+        count, total, low, high, m2 = _summarize(values, self.variance)
+        if isinstance(total, float):
+            self._add_float(total)
+        else:
+            self._int_total += total
+        self._min = low if self._min is None else min(self._min, low)
+        self._max = high if self._max is None else max(self._max, high)
+        if self.variance:
+            mean = total / count
+            merged = self.count + count
+            delta = mean - self._mean
+            self._m2 += m2 + delta * delta * self.count * count / merged
+            self._mean += delta * count / merged
+        if self.percentiles:
+            self._sample(values)
+        self.count += count
+
+    def _add_float(self, value: float) -> None:
+        # Neumaier compensated summation across chunk totals
+        self._has_floats = True
+        total = self._float_total + value
+        if abs(self._float_total) >= abs(value):
+            self._compensation += (self._float_total - total) + value
+        else:
+            self._compensation += (value - total) + self._float_total
+        self._float_total = total
+
+    def _sample(self, values: Any) -> None:
+        # Algorithm L: jumps straight to the next replaced index instead of drawing per element
+        size = self._reservoir_size
+        start = 0
+        if len(self._reservoir) < size:
+            start = min(size - len(self._reservoir), len(values))
+            self._reservoir.extend(values[:start].tolist() if hasattr(values, 'tolist') else values[:start])
+            if len(self._reservoir) < size:
+                return
+            self._weight = math.exp(math.log(self._random.random()) / size)
+            self._next_sample = self.count + start + self._skip()
+        end = self.count + len(values)
+        while self._next_sample < end:
+            self._reservoir[self._random.randrange(size)] = values[self._next_sample - self.count]
+            self._weight *= math.exp(math.log(self._random.random()) / size)
+            self._next_sample += 1 + self._skip()
+
+    def _skip(self) -> int:
+        return math.floor(math.log(self._random.random()) / math.log(1 - self._weight))
+
+    def result(self) -> Dict[str, Any]:
+        if not self.count:
+            raise ValueError("No numbers have been added")
+        total = self._int_total
+        if self._has_floats:
+            total += self._float_total + self._compensation
+        stats = {
+            'sum': total,
+            'average': total / self.count,
+            'min': self._min,
+            'max': self._max,
+            'count': self.count,
+        }
+        if self.variance:
+            stats['variance'] = self._m2 / self.count
+        if self.percentiles:
+            sample = sorted(self._reservoir)
+            stats['percentiles'] = {q: _percentile(sample, q) for q in self.percentiles}
+        return stats
+
+# Filter predicates and index used by DataProcessor.filter_data
+class Range:
+    """Matches items whose value for the key lies between low and high (inclusive, None is unbounded)."""
+    def __init__(self, low: Any = None, high: Any = None):
+        self.low = low
+        self.high = high
+
+    def contains(self, value: Any) -> bool:
+        try:
+            return (self.low is None or value >= self.low) and (self.high is None or value <= self.high)
+        except TypeError:
+            return False
+
+    def matches(self, item: Dict, key: str) -> bool:
+        return key in item and self.contains(item[key])
+
+class In:
+    """Matches items whose value for the key equals any of the given values."""
+    def __init__(self, values: Iterable):
+        self.values = list(values)
+
+    def contains(self, value: Any) -> bool:
+        return any(value == candidate for candidate in self.values)
+
+    def matches(self, item: Dict, key: str) -> bool:
+        return key in item and self.contains(item[key])
+
+class Missing:
+    """Matches items that do not have the key at all."""
+    def matches(self, item: Dict, key: str) -> bool:
+        return key not in item
+
+_PREDICATES = (Range, In, Missing)
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+def _value_matches(value: Any, expected: Any) -> bool:
+    """Whether a present value satisfies an equality, Range or In criterion."""
+    if isinstance(expected, (Range, In)):
+        return expected.contains(value)
+    return value == expected
+
+def _matches(item: Dict, key: str, expected: Any) -> bool:
+    if isinstance(expected, _PREDICATES):
+        return expected.matches(item, key)
+    return key in item and item[key] == expected
+
+class FilterIndex:
+    """
+    Hash indexes over a list of dictionaries for repeated filter_data queries.
+    - Each key maps every hashable value to the set (posting list) of row ids holding it
+    - Range queries bisect a cached sorted list of the key's distinct values
+    - The planner starts from the most selective criterion and, for the rest, either
+      intersects posting lists or checks the remaining candidates directly, whichever is cheaper
+    Items must not be mutated while indexed; remove and re-add them instead.
+    """
+    def __init__(self, items: Iterable[Dict] = ()):
+        self._rows: Dict[int, Dict] = {}
+        self._next_id = 0
+        self._postings: Dict[str, Dict[Any, Set[int]]] = defaultdict(dict)
+        self._present: Dict[str, Set[int]] = defaultdict(set)
+        self._unhashable: Dict[str, Set[int]] = defaultdict(set)
+        self._sorted_values: Dict[str, Optional[List]] = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, item: Dict) -> int:
+        """Indexes item and returns its row id."""
+        row_id = self._next_id
+        self._next_id += 1
+        self._rows[row_id] = item
+        present = self._present
+        all_postings = self._postings
+        for key, value in item.items():
+            present[key].add(row_id)
+            postings = all_postings[key]
+            try:
+                ids = postings.get(value)
+            except TypeError:
+                self._unhashable[key].add(row_id)
+                continue
+            if ids is None:
+                postings[value] = {row_id}
+                self._sorted_values.pop(key, None)
+            else:
+                ids.add(row_id)
+        return row_id
+
+    def remove(self, row_id: int) -> Dict:
+        """Removes the row with the given id from the index and returns its item."""
+        item = self._rows.pop(row_id)
+        for key, value in item.items():
+            self._present[key].discard(row_id)
+            if not _is_hashable(value):
+                self._unhashable[key].discard(row_id)
+                continue
+            postings = self._postings[key]
+            postings[value].discard(row_id)
+            if not postings[value]:
+                del postings[value]
+                self._sorted_values.pop(key, None)
+        return item
+
+    def filter(self, criteria: Dict) -> List[Dict]:
+        """Returns the indexed items matching every criterion, in insertion order."""
+        if not self._rows or not criteria:
+            return []
+        plans = sorted((self._estimate(key, expected), key, expected) for key, expected in criteria.items())
+        _, key, expected = plans[0]
+        candidates = self._lookup(key, expected)
+        for estimate, key, expected in plans[1:]:
+            if not candidates:
+                break
+            if estimate <= len(candidates):
+                candidates &= self._lookup(key, expected)
+            else:
+                rows = self._rows
+                candidates = {row_id for row_id in candidates if _matches(rows[row_id], key, expected)}
+        return [self._rows[row_id] for row_id in sorted(candidates)]
+
+    def _estimate(self, key: str, expected: Any) -> float:
+        """Estimated number of rows matching a single criterion."""
+        postings = self._postings.get(key, {})
+        if isinstance(expected, Missing):
+            return len(self._rows) - len(self._present.get(key, ()))
+        if isinstance(expected, In):
+            return sum(len(postings.get(value, ())) if _is_hashable(value) else len(self._unhashable[key])
+                       for value in expected.values)
+        if isinstance(expected, Range):
+            distinct = self._distinct_in_range(key, expected)
+            return len(distinct) * len(self._present.get(key, ())) / max(len(postings), 1)
+        if not _is_hashable(expected):
+            return len(self._unhashable.get(key, ()))
+        return len(postings.get(expected, ()))
+
+    def _lookup(self, key: str, expected: Any) -> Set[int]:
+        """Row ids matching a single criterion, as a new set."""
+        postings = self._postings.get(key, {})
+        if isinstance(expected, Missing):
+            return set(self._rows).difference(self._present.get(key, ()))
+        if isinstance(expected, In):
+            result = set()
+            for value in expected.values:
+                result |= self._lookup(key, value)
+            return result
+        if isinstance(expected, Range):
+            result = set()
+            for value in self._distinct_in_range(key, expected):
+                result |= postings[value]
+            return result
+        if not _is_hashable(expected):
+            rows = self._rows
+            return {row_id for row_id in self._unhashable.get(key, ()) if rows[row_id][key] == expected}
+        return set(postings.get(expected, ()))
+
+    def _distinct_in_range(self, key: str, bounds: Range) -> List:
+        if key not in self._sorted_values:
+            try:
+                self._sorted_values[key] = sorted(self._postings.get(key, {}))
+            except TypeError:
+                self._sorted_values[key] = None
+        ordered = self._sorted_values[key]
+        if ordered is not None:
+            try:
+                start = 0 if bounds.low is None else bisect.bisect_left(ordered, bounds.low)
+                end = len(ordered) if bounds.high is None else bisect.bisect_right(ordered, bounds.high)
+            except TypeError:
+                pass
+            else:
+                return ordered[start:end]
+        # Values or bounds of incomparable types: compare each distinct value individually
+        return [value for value in self._postings.get(key, {}) if bounds.contains(value)]
+
+# Columnar record store accepted by DataProcessor
+_MISSING = object()
+
+def _vectorizable(value: Any) -> bool:
+    """Whether NumPy compares value against an int64 or float64 array exactly as Python would."""
+    if isinstance(value, (float, np.floating, np.integer)):
+        return True
+    return type(value) in (int, bool) and -2 ** 63 <= value < 2 ** 63
+
+class _NumericColumn:
+    """Typed array of ints ('q') or floats ('d'), with a validity bytearray when some rows lack the key."""
+    def __init__(self, data: array.array, valid: Optional[bytearray] = None):
+        self.data = data
+        self.valid = valid
+
+    def get(self, row: int) -> Any:
+        if self.valid is not None and not self.valid[row]:
+            return _MISSING
+        return self.data[row]
+
+    def _test(self, expected: Any):
+        if isinstance(expected, Missing):
+            return None
+        if isinstance(expected, (Range, In)):
+            return expected.contains
+        return lambda value: value == expected
+
+    def select(self, expected: Any, rows: Iterable[int]) -> List[int]:
+        data, valid = self.data, self.valid
+        test = self._test(expected)
+        if test is None:
+            return [] if valid is None else [i for i in rows if not valid[i]]
+        if valid is None:
+            return [i for i in rows if test(data[i])]
+        return [i for i in rows if valid[i] and test(data[i])]
+
+    def mask(self, expected: Any) -> Any:
+        data = np.frombuffer(self.data, dtype=np.int64 if self.data.typecode == 'q' else np.float64)
+        valid = np.ones(len(data), dtype=bool) if self.valid is None else np.frombuffer(self.valid, dtype=bool)
+        if isinstance(expected, Missing):
+            return ~valid
+        if isinstance(expected, Range):
+            bounds = [b for b in (expected.low, expected.high) if b is not None]
+            if not all(map(_vectorizable, bounds)):
+                return self._scan_mask(expected)
+            result = valid.copy()
+            if expected.low is not None:
+                result &= data >= expected.low
+            if expected.high is not None:
+                result &= data <= expected.high
+            return result
+        if isinstance(expected, In):
+            if not all(map(_vectorizable, expected.values)):
+                return self._scan_mask(expected)
+            return valid & np.isin(data, expected.values)
+        if not _vectorizable(expected):
+            return self._scan_mask(expected)
+        return valid & (data == expected)
+
+    def _scan_mask(self, expected: Any) -> Any:
+        # Candidates NumPy cannot compare natively (Decimal, Fraction, huge ints, strings)
+        # are compared value by value, as the list-of-dicts scan does
+        result = np.zeros(len(self.data), dtype=bool)
+        result[self.select(expected, range(len(self.data)))] = True
+        return result
+
+    def values(self, selection: Optional[Sequence[int]] = None) -> Any:
+        if selection is None and self.valid is None:
+            return self.data
+        rows = range(len(self.data)) if selection is None else selection
+        if self.valid is not None:
+            valid = self.valid
+            rows = [i for i in rows if valid[i]]
+        if np is not None:
+            view = np.frombuffer(self.data, dtype=np.int64 if self.data.typecode == 'q' else np.float64)
+            return view[np.asarray(rows, dtype=np.intp)]
+        return array.array(self.data.typecode, map(self.data.__getitem__, rows))
+
+class _DictColumn:
+    """Dictionary-encoded hashable values: an int32 code per row (-1 when missing) plus the distinct values."""
+    def __init__(self, codes: array.array, dictionary: List):
+        self.codes = codes
+        self.dictionary = dictionary
+        # Equality queries match every code whose value compares equal (1, 1.0 and True alike)
+        self.lookup: Dict[Any, List[int]] = {}
+        for code, value in enumerate(dictionary):
+            self.lookup.setdefault(value, []).append(code)
+
+    def get(self, row: int) -> Any:
+        code = self.codes[row]
+        return _MISSING if code < 0 else self.dictionary[code]
+
+    def _codes_for(self, expected: Any) -> Set[int]:
+        if isinstance(expected, Missing):
+            return {-1}
+        if isinstance(expected, Range):
+            return {code for code, value in enumerate(self.dictionary) if expected.contains(value)}
+        values = expected.values if isinstance(expected, In) else [expected]
+        return {code for v in values if _is_hashable(v) for code in self.lookup.get(v, ())}
+
+    def select(self, expected: Any, rows: Iterable[int]) -> List[int]:
+        codes = self.codes
+        wanted = self._codes_for(expected)
+        if len(wanted) == 1:
+            code = next(iter(wanted))
+            return [i for i in rows if codes[i] == code]
+        return [i for i in rows if codes[i] in wanted]
+
+    def mask(self, expected: Any) -> Any:
+        return np.isin(np.frombuffer(self.codes, dtype=np.int32), list(self._codes_for(expected)))
+
+    def values(self, selection: Optional[Sequence[int]] = None) -> List:
+        rows = range(len(self.codes)) if selection is None else selection
+        codes, dictionary = self.codes, self.dictionary
+        return [dictionary[codes[i]] for i in rows if codes[i] >= 0]
+
+class _ObjectColumn:
+    """Fallback for unhashable or mixed values, stored as a plain list."""
+    def __init__(self, values: List):
+        self.data = values
+
+    def get(self, row: int) -> Any:
+        return self.data[row]
+
+    def select(self, expected: Any, rows: Iterable[int]) -> List[int]:
+        data = self.data
+        if isinstance(expected, Missing):
+            return [i for i in rows if data[i] is _MISSING]
+        return [i for i in rows if data[i] is not _MISSING and _value_matches(data[i], expected)]
+
+    def mask(self, expected: Any) -> Any:
+        return np.isin(np.arange(len(self.data)), self.select(expected, range(len(self.data))))
+
+    def values(self, selection: Optional[Sequence[int]] = None) -> List:
+        rows = range(len(self.data)) if selection is None else selection
+        data = self.data
+        return [data[i] for i in rows if data[i] is not _MISSING]
+
+# Values of these types that compare equal are indistinguishable, so they can share a dictionary code
+_EXACT_TYPES = frozenset((str, bytes, int, bool, type(None)))
+
+def _dictionary_key(value: Any) -> Tuple:
+    """Dictionary-encoding key; raises TypeError for unhashable values."""
+    kind = type(value)
+    if kind in _EXACT_TYPES:
+        return kind, value
+    # Equal values can still differ in form: Decimal('1.0') and Decimal('1.00'), 0.0 and -0.0
+    key = (kind, value, repr(value))
+    hash(key)
+    return key
+
+class _ColumnBuilder:
+    """
+    Accumulates one column row by row, starting as a typed array and widening to a
+    dictionary-encoded column, then to a plain list, when a value does not fit.
+    """
+    def __init__(self):
+        self.mode: Optional[str] = None  # 'q', 'd', 'dict' or 'object' once the first value arrives
+        self.num_rows = 0
+
+    def append(self, row: int, value: Any) -> None:
+        """Stores value at row; rows skipped since the last append are missing."""
+        if row > self.num_rows:
+            self._pad(row - self.num_rows)
+        mode = self.mode
+        if mode == 'q':
+            if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+                self.data.append(value)
+                self.valid.append(1)
+                self.num_rows += 1
+                return
+            self._to_dictionary()
+        elif mode == 'd':
+            if type(value) is float:
+                self.data.append(value)
+                self.valid.append(1)
+                self.num_rows += 1
+                return
+            self._to_dictionary()
+        elif mode is None:
+            self._start(value)
+            self.append(row, value)
+            return
+        if self.mode == 'dict':
+            try:
+                key = _dictionary_key(value)
+            except TypeError:
+                self._to_object()
+            else:
+                code = self.encode.get(key)
+                if code is None:
+                    code = self.encode[key] = len(self.dictionary)
+                    self.dictionary.append(value)
+                self.codes.append(code)
+                self.num_rows += 1
+                return
+        self.data.append(value)
+        self.num_rows += 1
+
+    def _start(self, value: Any) -> None:
+        leading = self.num_rows
+        if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            self.mode = 'q'
+        elif type(value) is float:
+            self.mode = 'd'
+        else:
+            self.mode = 'dict'
+            self.codes = array.array('i', [-1]) * leading
+            self.dictionary: List = []
+            self.encode: Dict[Tuple, int] = {}
+            return
+        self.data = array.array(self.mode, [0]) * leading
+        self.valid = bytearray(leading)
+
+    def _pad(self, count: int) -> None:
+        mode = self.mode
+        if mode in ('q', 'd'):
+            self.data.extend(array.array(mode, [0]) * count)
+            self.valid.extend(bytearray(count))
+        elif mode == 'dict':
+            self.codes.extend(array.array('i', [-1]) * count)
+        elif mode == 'object':
+            self.data.extend([_MISSING] * count)
+        self.num_rows += count
+
+    def _values(self) -> List:
+        if self.mode == 'dict':
+            dictionary = self.dictionary
+            return [_MISSING if code < 0 else dictionary[code] for code in self.codes]
+        return [v if ok else _MISSING for v, ok in zip(self.data, self.valid)]
+
+    def _to_dictionary(self) -> None:
+        values = self._values()
+        self.mode = 'dict'
+        self.codes = array.array('i')
+        self.dictionary = []
+        self.encode = {}
+        del self.data, self.valid
+        self.num_rows = 0
+        for row, value in enumerate(values):
+            if value is not _MISSING:
+                self.append(row, value)
+        self._pad(len(values) - self.num_rows)
+
+    def _to_object(self) -> None:
+        values = self._values()
+        if self.mode == 'dict':
+            del self.codes, self.dictionary, self.encode
+        self.mode = 'object'
+        self.data = values
+
+    def finish(self, num_rows: int) -> Any:
+        """Pads the column to num_rows and returns the finished column."""
+        if num_rows > self.num_rows:
+            self._pad(num_rows - self.num_rows)
+        mode = self.mode
+        if mode in ('q', 'd'):
+            return _NumericColumn(self.data, None if all(self.valid) else self.valid)
+        if mode == 'dict':
+            return _DictColumn(self.codes, self.dictionary)
+        return _ObjectColumn(self.data)
+
+class RowView(Mapping):
+    """Read-only dict-like view of one ColumnStore row; values are decoded on access."""
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: 'ColumnStore', row: int):
+        self._store = store
+        self._row = row
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._store.columns.get(key)
+        value = _MISSING if column is None else column.get(self._row)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        row = self._row
+        return (key for key, column in self._store.columns.items() if column.get(row) is not _MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"RowView({dict(self)!r})"
+
+class ColumnStore:
+    """
+    Compact column-oriented storage for a list of dictionaries.
+    - int and float columns are typed arrays; other hashable values are dictionary-encoded
+    - filter returns a selection vector of row numbers instead of building dicts
+    - column returns a column's values, optionally only for a selection
+    - row and rows give lazy dict-like RowView objects
+    """
+    def __init__(self, columns: Dict[str, Any], num_rows: int):
+        self.columns = columns
+        self.num_rows = num_rows
+
+    @classmethod
+    def from_records(cls, items: Iterable[Dict]) -> 'ColumnStore':
+        """Builds the columns one record at a time, so items can be a generator larger than memory as dicts."""
+        builders: Dict[str, _ColumnBuilder] = {}
+        num_rows = 0
+        for row, item in enumerate(items):
+            for key, value in item.items():
+                builder = builders.get(key)
+                if builder is None:
+                    builder = builders[key] = _ColumnBuilder()
+                builder.append(row, value)
+            num_rows = row + 1
+        return cls({key: builder.finish(num_rows) for key, builder in builders.items()}, num_rows)
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def filter(self, criteria: Dict) -> array.array:
+        """Row numbers matching every criterion (equality, Range, In or Missing), in order, as array('q')."""
+        if np is not None:
+            mask = np.ones(self.num_rows, dtype=bool)
+            for key, expected in criteria.items():
+                column = self.columns.get(key)
+                if column is None:
+                    if not isinstance(expected, Missing):
+                        return array.array('q')
+                    continue
+                mask &= column.mask(expected)
+            selection = array.array('q')
+            selection.frombytes(np.flatnonzero(mask).astype(np.int64).tobytes())
+            return selection
+        rows: Iterable[int] = range(self.num_rows)
+        for key, expected in criteria.items():
+            column = self.columns.get(key)
+            if column is None:
+                if not isinstance(expected, Missing):
+                    return array.array('q')
+                continue
+            rows = column.select(expected, rows)
+        return array.array('q', rows)
+
+    def column(self, key: str, selection: Optional[Sequence[int]] = None) -> Any:
+        """Values present in a column, restricted to selection when given; numeric columns stay typed."""
+        return self.columns[key].values(selection)
+
+    def row(self, row: int) -> RowView:
+        return RowView(self, row)
+
+    def rows(self, selection: Optional[Sequence[int]] = None) -> List[RowView]:
+        return [RowView(self, int(row)) for row in (range(self.num_rows) if selection is None else selection)]
+
 class DataProcessor:
-    def process_numbers(self, numbers: List[int]) -> Dict[str, float]:
+    def process_numbers(self, numbers: List[int], variance: bool = False,
+                        percentiles: Sequence[float] = (), count: bool = False) -> Dict[str, float]:
         """
         Processes a list of numbers and returns statistics.
+        Also accepts array.array, NumPy arrays and other buffers without copying.
+        Optionally adds the population variance, exact percentiles and the count.
         Write tests that:
         - Verify correct calculations
         - Handle empty lists
         - Test with negative numbers
         - Check for numerical precision
         """
-        if not numbers:
+        _check_percentiles(percentiles)
+        values = _as_numeric(numbers)
+        if not len(values):
             raise ValueError("Input list cannot be empty")
         
-        return {
-            'sum': sum(numbers),
-            'average': sum(numbers) / len(numbers),
-            'min': min(numbers),
-            'max': max(numbers)
+        size, total, low, high, m2 = _summarize(values, variance)
+        stats = {
+            'sum': total,
+            'average': total / size,
+            'min': low,
+            'max': high
         }
+        if count:
+            stats['count'] = size
+        if variance:
+            stats['variance'] = m2 / size
+        if percentiles:
+            if np is not None and isinstance(values, np.ndarray):
+                points = np.percentile(values, percentiles).tolist()
+                stats['percentiles'] = dict(zip(percentiles, points))
+            else:
+                ordered = sorted(values)
+                stats['percentiles'] = {q: _percentile(ordered, q) for q in percentiles}
+        return stats
 
-    def filter_data(self, items: List[Dict], criteria: Dict) -> List[Dict]:
+    def filter_data(self, items: Union[List[Dict], FilterIndex, ColumnStore], criteria: Dict) -> List[Dict]:
         """
         Filters a list of dictionaries based on given criteria.
+        Criteria values are matched by equality, or by a Range, In or Missing predicate.
+        Pass a FilterIndex instead of a list to answer repeated queries from its indexes,
+        or a ColumnStore to get lazy RowView results.
         Write tests that:
         - Verify correct filtering
         - Handle missing keys
@@ -89,18 +1138,102 @@ class DataProcessor:
         """
         if not items or not criteria:
             return []
+        if isinstance(items, FilterIndex):
+            return items.filter(criteria)
+        if isinstance(items, ColumnStore):
+            return items.rows(items.filter(criteria))
         
         result = []
         for item in items:
             matches = True
             for key, value in criteria.items():
-                if key not in item or item[key] != value:
+                if not _matches(item, key, value):
                     matches = False
                     break
             if matches:
                 result.append(item)
         return result
 
+    def build_index(self, items: List[Dict]) -> FilterIndex:
+        """Builds a FilterIndex over items for repeated filter_data calls."""
+        return FilterIndex(items)
+
+def benchmark_column_store(num_rows: int = 1_000_000) -> None:
+    """
+    Compares memory and query throughput of a list of dicts against a ColumnStore.
+    Run with: python -c "import unit_testing; unit_testing.benchmark_column_store()"
+    """
+    import gc
+    import tracemalloc
+
+    rng = random.Random(0)
+    cities = ['NY', 'LA', 'SF', 'Chicago', 'Boston']
+    processor = DataProcessor()
+    tracemalloc.start()
+    items = [{'id': i, 'city': rng.choice(cities), 'age': rng.randint(18, 80), 'score': rng.random()}
+             for i in range(num_rows)]
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    store = ColumnStore.from_records(items)
+    store_bytes = tracemalloc.get_traced_memory()[0] - list_bytes
+    tracemalloc.stop()
+    gc.collect()
+    print(f"memory: list of dicts {list_bytes / 2 ** 20:,.1f} MB, ColumnStore {store_bytes / 2 ** 20:,.1f} MB")
+
+    criteria = {'city': 'SF', 'age': Range(30, 40)}
+    start = time.perf_counter()
+    selected = processor.filter_data(items, criteria)
+    stats = processor.process_numbers([item['score'] for item in selected])
+    list_time = time.perf_counter() - start
+    start = time.perf_counter()
+    selection = store.filter(criteria)
+    store_stats = processor.process_numbers(store.column('score', selection))
+    store_time = time.perf_counter() - start
+    assert len(selected) == len(selection) and stats['max'] == store_stats['max']
+    print(f"filter + stats over {num_rows:,} rows: list of dicts {num_rows / list_time:,.0f} rows/sec, "
+          f"ColumnStore {num_rows / store_time:,.0f} rows/sec")
+
+def benchmark_user_stats(calls: int = 1_000_000, num_users: int = 100_000) -> None:
+    """
+    Compares hot get_user_stats call rates with a database COUNT on every call
+    (stats_ttl=0) against the cached, incrementally maintained counters.
+    Run with: python -c "import unit_testing; unit_testing.benchmark_user_stats()"
+    """
+    class SQLiteUsers:
+        def __init__(self):
+            self.connection = sqlite3.connect(':memory:')
+            self.connection.executescript(USERS_SCHEMA)
+
+        def insert(self, table, user):
+            cursor = self.connection.execute(
+                f'INSERT INTO {table} (username, email, created_at, active) VALUES (?, ?, ?, ?)',
+                (user['username'], user['email'], user['created_at'].isoformat(), user['active']))
+            return cursor.lastrowid
+
+        def exists(self, table, query):
+            return self.connection.execute(
+                f'SELECT 1 FROM {table} WHERE username = ?', (query['username'],)).fetchone() is not None
+
+        def count(self, table):
+            return self.connection.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+
+    database = SQLiteUsers()
+    for mode, manager in [('count per call', UserManager(database, stats_ttl=0)),
+                          ('cached', UserManager(database)),
+                          ('cached + HLL', UserManager(database, approximate_active=True))]:
+        if not database.count('users'):
+            for i in range(num_users):
+                manager.add_user(f'user{i}', f'user{i}@example.com')
+        else:
+            for i in range(num_users):
+                manager.active_users.add(f'user{i}')
+        runs = calls if mode != 'count per call' else max(calls // 100, 1)
+        start = time.perf_counter()
+        for _ in range(runs):
+            stats = manager.get_user_stats()
+        rate = runs / (time.perf_counter() - start)
+        print(f"{mode:<16}{rate:>14,.0f} calls/sec  {stats}")
+
 # Write your tests here
 class TestUserManager(unittest.TestCase):
     """Write comprehensive unit tests for the UserManager class"""
@@ -108,4 +1241,63 @@ class TestUserManager(unittest.TestCase):
 
 class TestDataProcessor(unittest.TestCase):
     """Write comprehensive unit tests for the DataProcessor class"""
-    pass 
\ No newline at end of file
+    pass 
+
+class TestAsyncUserManager(unittest.IsolatedAsyncioTestCase):
+    """Batched onboarding through a pool of connections to one shared in-memory database"""
+    async def asyncSetUp(self):
+        database = f'file:test-users-{id(self)}?mode=memory&cache=shared'
+        # Keeps the shared database alive for the test and creates the schema
+        self.keeper = SQLiteConnection(database)
+        self.keeper.execute_script(USERS_SCHEMA)
+        self.pool = ConnectionPool(lambda: SQLiteConnection(database), size=3)
+        self.manager = AsyncUserManager(self.pool, batch_size=4)
+
+    async def asyncTearDown(self):
+        self.keeper.connection.close()
+
+    async def test_bulk_insert_is_batched_and_deduplicated_across_the_pool(self):
+        users = [(f'user{i}', f'user{i}@example.com') for i in range(20)]
+        users += [('user3', 'again@example.com'), ('bad', 'not-an-email'), ('user25', 'user25@example.com')]
+        result = await self.manager.add_users_bulk(users)
+
+        self.assertEqual(len(result['created']), 21)
+        self.assertEqual(result['failed'], [(20, 'user3', "Username already exists"),
+                                            (21, 'bad', "Invalid email format")])
+        self.assertEqual(self.keeper.connection.execute('SELECT COUNT(*) FROM users').fetchone()[0], 21)
+
+        # A second call sees rows written by every pooled connection
+        result = await self.manager.add_users_bulk([('user7', 'x@example.com'), ('user19', 'y@example.com'),
+                                                    ('new', 'new@example.com')])
+        self.assertEqual([user['username'] for user in result['created']], ['new'])
+        self.assertEqual([failure[1] for failure in result['failed']], ['user7', 'user19'])
+        stats = await self.manager.get_user_stats()
+        self.assertEqual(stats['total_users'], 22)
+
+    async def test_pooled_connections_share_one_database(self):
+        async with self.pool.acquire() as first, self.pool.acquire() as second:
+            self.assertIsNot(first, second)
+            await first.insert_many('users', [{'username': 'shared', 'email': 'shared@example.com',
+                                               'created_at': datetime.now(), 'active': True}])
+            self.assertEqual(await second.exists_many('users', 'username', ['shared']), {'shared'})
+
+    def test_default_connections_share_one_database(self):
+        first, second = SQLiteConnection(), SQLiteConnection()
+        try:
+            first.execute_script('CREATE TABLE default_shared (value INTEGER)')
+            second.execute_script('INSERT INTO default_shared VALUES (1)')
+            self.assertEqual(first.connection.execute('SELECT value FROM default_shared').fetchall(), [(1,)])
+        finally:
+            first.execute_script('DROP TABLE IF EXISTS default_shared')
+            first.connection.close()
+            second.connection.close()
+
+    async def test_batch_error_fails_each_row_of_the_batch(self):
+        async def store_down(*args):
+            raise RuntimeError("store down")
+
+        with patch.object(SQLiteConnection, 'exists_many', store_down):
+            result = await self.manager.add_users_bulk([(f'u{i}', f'u{i}@example.com') for i in range(6)])
+        self.assertEqual(result['created'], [])
+        self.assertEqual([(index, reason) for index, _, reason in result['failed']],
+                         [(i, "store down") for i in range(6)])
@@ -31,11 +31,25 @@ Design and implement:
 4. Caching strategy
 """
 
-# Example schema design (SQLAlchemy-style)
+import asyncio
+import bisect
+import heapq
+import itertools
+import json
+import math
+import random
+import time
+from array import array
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Example schema design (SQLAlchemy-style)
+try:
+    from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+    from sqlalchemy.orm import relationship
+except ImportError:  # Only the schema sketches below need SQLAlchemy; the engines do not
+    Column = Integer = String = Float = DateTime = ForeignKey = relationship = None
 
 class User:
     """
@@ -96,42 +110,774 @@ Design and implement:
 4. Scalability approach
 """
 
+# In-memory stand-ins for the external services, so the platform runs and can be benchmarked locally
+class InMemoryCache:
+    """
+    Stand-in for an external cache such as Redis: an LRU map of at most capacity keys.
+    - get/set refresh a key's recency; peek reads without touching it
+    - hits and misses are counted for benchmarks
+    """
+    def __init__(self, capacity: int = 1_000_000):
+        self.capacity = capacity
+        self._items: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Any) -> Any:
+        return self._items.get(key)
+
+    def set(self, key: Any, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        self._items.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class InMemoryQueue:
+    """
+    Stand-in for a message broker: one FIFO per topic, consumed in batches.
+    publish_latency seconds are spent per publish call, as a network round trip would be.
+    """
+    def __init__(self, publish_latency: float = 0.0):
+        self._topics: Dict[str, deque] = defaultdict(deque)
+        self.publish_latency = publish_latency
+
+    def publish(self, topic: str, message: Any) -> None:
+        self.publish_many(topic, (message,))
+
+    def publish_many(self, topic: str, messages: Iterable[Any]) -> None:
+        if self.publish_latency:
+            time.sleep(self.publish_latency)
+        self._topics[topic].extend(messages)
+
+    def consume(self, topic: str, max_messages: Optional[int] = None) -> List[Any]:
+        queue = self._topics[topic]
+        count = len(queue) if max_messages is None else min(max_messages, len(queue))
+        return [queue.popleft() for _ in range(count)]
+
+    def pending(self, topic: str) -> int:
+        return len(self._topics[topic])
+
+
+class InMemoryStorage:
+    """
+    Stand-in for the primary store.
+    - posts: post_id -> post; ids grow in creation order
+    - following / followers: user_id -> array of user ids
+    - author_posts: author_id -> array of the author's post ids, oldest first
+    - interactions: (user_id, author_id) -> interaction count, read by the default ranking
+    - blocked: user_id -> authors whose posts are filtered out of the user's feed
+    - post_stats: post_id -> {'likes', 'shares', 'comments'} counters
+    - likes / shares: post_id -> users who liked / shared it, so repeats count once
+    Every write goes through commit, which spends write_latency seconds as a round trip would.
+    """
+    def __init__(self, write_latency: float = 0.0):
+        self.posts: Dict[int, dict] = {}
+        self.following: Dict[int, array] = {}
+        self.followers: Dict[int, array] = {}
+        self.author_posts: Dict[int, array] = {}
+        self.interactions: Dict[Tuple[int, int], int] = {}
+        self.blocked: Dict[int, set] = {}
+        self.post_stats: Dict[int, Dict[str, int]] = {}
+        self.likes: Dict[int, set] = {}
+        self.shares: Dict[int, set] = {}
+        self.write_latency = write_latency
+        self.writes = 0
+
+    def commit(self) -> None:
+        self.writes += 1
+        if self.write_latency:
+            time.sleep(self.write_latency)
+
+
+class FeedTimeline:
+    """
+    A user's precomputed feed: (score, post_id) entries kept in ascending order in two
+    typed arrays (16 bytes per entry). Past capacity the lowest-ranked entry is dropped,
+    so a timeline never grows beyond what a reader pages through.
+    """
+    __slots__ = ('scores', 'ids', 'capacity')
+
+    def __init__(self, capacity: int):
+        self.scores = array('d')
+        self.ids = array('q')
+        self.capacity = capacity
+
+    def _position(self, score: float, post_id: int) -> int:
+        # Index of (score, post_id): scores are sorted, ids are sorted among equal scores
+        lo = bisect.bisect_left(self.scores, score)
+        hi = bisect.bisect_right(self.scores, score, lo)
+        return bisect.bisect_left(self.ids, post_id, lo, hi)
+
+    def add(self, score: float, post_id: int) -> bool:
+        scores, ids = self.scores, self.ids
+        if len(scores) >= self.capacity and (score, post_id) <= (scores[0], ids[0]):
+            return False
+        i = self._position(score, post_id)
+        if i < len(ids) and ids[i] == post_id and scores[i] == score:
+            return False
+        scores.insert(i, score)
+        ids.insert(i, post_id)
+        if len(scores) > self.capacity:
+            del scores[0]
+            del ids[0]
+        return True
+
+    def newest(self, cursor: Optional[Tuple[float, int]] = None) -> Iterator[Tuple[float, int]]:
+        """Entries ranked below cursor (all of them when None), highest first"""
+        i = len(self.ids) if cursor is None else self._position(*cursor)
+        scores, ids = self.scores, self.ids
+        while i > 0:
+            i -= 1
+            yield scores[i], ids[i]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+class FeedCursor(NamedTuple):
+    """
+    Position in a paged feed: the last item's (score, post_id), plus the followed
+    celebrities and the user's interaction count with each as of the first page.
+    Later pages rank celebrity posts from that snapshot, so a like between pages
+    cannot lift posts above the cursor, and an author who crosses the celebrity
+    threshold mid-session stays in the source they started in.
+    """
+    score: float
+    post_id: int
+    celebrities: Tuple[Tuple[int, int], ...]
+
+
 # Example implementation structure
 class SocialPlatform:
     """
-    Design the core platform architecture.
-    Consider:
-    - Service boundaries
-    - Data partitioning
-    - Caching layers
-    - Message queues
+    Hybrid fan-out feed engine.
+    - Posts by accounts with fewer than celebrity_threshold followers are fanned out on
+      write: a queue worker (process_fanout) inserts them into the cached FeedTimeline of
+      every follower whose timeline is cached; other followers are rebuilt on read
+    - Posts by celebrities are only appended to the author's own post list and merged in
+      on read, so one post never means millions of timeline writes
+    - generate_feed merges the user's timeline with the post lists of the celebrities
+      they follow through a lazy k-way heap merge, and pages with a FeedCursor
     """
-    def __init__(self):
-        self.cache = None
-        self.message_queue = None
-        self.storage = None
+    def __init__(
+        self,
+        celebrity_threshold: int = 10_000,
+        timeline_size: int = 800,
+        cache_capacity: int = 1_000_000,
+        ranking: Optional[Callable[[dict, int], float]] = None,
+        affinity_boost: float = 3600.0,
+    ):
+        """
+        ranking(post, user_id) scores a post for a user, higher first. For a fixed user
+        and author it must not decrease with the post's created_at, so every source of
+        the merge is already in rank order. The default is created_at plus affinity_boost
+        seconds per e-fold of the user's interactions with the author. Fanned-out entries
+        keep the score they were written with.
+        """
+        self.cache = InMemoryCache(cache_capacity)
+        self.message_queue = InMemoryQueue()
+        self.storage = InMemoryStorage()
+        self.celebrity_threshold = celebrity_threshold
+        self.timeline_size = timeline_size
+        self.ranking = ranking
+        self.affinity_boost = affinity_boost
+        self._post_ids = itertools.count(1)
+        self.interaction_pipeline: Optional['InteractionPipeline'] = None
+
+    def rank(self, post: dict, user_id: int, interactions: Optional[int] = None) -> float:
+        """Scores post for user_id; interactions overrides the stored count for the default ranking"""
+        if self.ranking is not None:
+            return self.ranking(post, user_id)
+        if interactions is None:
+            interactions = self.storage.interactions.get((user_id, post['author_id']), 0)
+        return post['created_at'] + self.affinity_boost * math.log1p(interactions)
 
-    def generate_feed(self, user_id: int) -> List[dict]:
+    def is_celebrity(self, user_id: int) -> bool:
+        return len(self.storage.followers.get(user_id, ())) >= self.celebrity_threshold
+
+    def follow(self, follower_id: int, followee_id: int) -> None:
+        storage = self.storage
+        storage.following.setdefault(follower_id, array('q')).append(followee_id)
+        storage.followers.setdefault(followee_id, array('q')).append(follower_id)
+        # Backfill a cached timeline with the followee's recent posts
+        timeline = self.cache.peek(('timeline', follower_id))
+        if timeline is not None and not self.is_celebrity(followee_id):
+            for post_id in storage.author_posts.get(followee_id, ())[-self.timeline_size:]:
+                timeline.add(self.rank(storage.posts[post_id], follower_id), post_id)
+
+    def unfollow(self, follower_id: int, followee_id: int) -> None:
+        storage = self.storage
+        was_celebrity = self.is_celebrity(followee_id)
+        try:
+            storage.following[follower_id].remove(followee_id)
+            storage.followers[followee_id].remove(follower_id)
+        except (KeyError, ValueError):
+            raise KeyError(f"User {follower_id} does not follow {followee_id}") from None
+        # The followee's entries are spread through the timeline; rebuild it on next read
+        self.cache.delete(('timeline', follower_id))
+        if was_celebrity and not self.is_celebrity(followee_id):
+            # Its posts were never fanned out, and timelines are now read without them
+            for other_id in storage.followers[followee_id]:
+                self.cache.delete(('timeline', other_id))
+
+    def block(self, user_id: int, author_id: int) -> None:
+        self.storage.blocked.setdefault(user_id, set()).add(author_id)
+
+    def create_post(self, author_id: int, content: str, created_at: Optional[float] = None) -> int:
+        """Stores a post and queues its fan-out; created_at must not decrease per author"""
+        post_id = next(self._post_ids)
+        post = {
+            'post_id': post_id,
+            'author_id': author_id,
+            'content': content,
+            'created_at': time.time() if created_at is None else created_at,
+        }
+        self.storage.posts[post_id] = post
+        self.storage.author_posts.setdefault(author_id, array('q')).append(post_id)
+        if not self.is_celebrity(author_id):
+            self.message_queue.publish('fanout', post_id)
+        return post_id
+
+    def process_fanout(self, max_messages: Optional[int] = None) -> int:
         """
-        Design the feed generation algorithm.
-        Consider:
-        - Relevance ranking
-        - Performance optimization
-        - Content filtering
-        - A/B testing support
+        Fan-out worker: writes queued posts into their followers' cached timelines.
+        Followers without a cached timeline are skipped, as their next read rebuilds it.
+        Returns the number of timeline entries written.
+        """
+        storage, cache = self.storage, self.cache
+        written = 0
+        for post_id in self.message_queue.consume('fanout', max_messages):
+            post = storage.posts[post_id]
+            for follower_id in storage.followers.get(post['author_id'], ()):
+                timeline = cache.peek(('timeline', follower_id))
+                if timeline is not None:
+                    written += timeline.add(self.rank(post, follower_id), post_id)
+        return written
+
+    def _timeline(self, user_id: int) -> FeedTimeline:
+        # Cache miss: fan out on read from the recent posts of every non-celebrity followee
+        timeline = self.cache.get(('timeline', user_id))
+        if timeline is None:
+            storage = self.storage
+            timeline = FeedTimeline(self.timeline_size)
+            for author_id in storage.following.get(user_id, ()):
+                if not self.is_celebrity(author_id):
+                    for post_id in storage.author_posts.get(author_id, ())[-self.timeline_size:]:
+                        timeline.add(self.rank(storage.posts[post_id], user_id), post_id)
+            self.cache.set(('timeline', user_id), timeline)
+        return timeline
+
+    def _author_posts(self, author_id: int, user_id: int, interactions: int,
+                      cursor: Optional[Tuple[float, int]]) -> Iterator[Tuple[float, int]]:
+        # A celebrity's posts ranked for user_id with a fixed interaction count, below cursor, highest first
+        ids, posts = self.storage.author_posts.get(author_id, array('q')), self.storage.posts
+        rank = self.rank
+        end = len(ids)
+        if cursor is not None:
+            end = bisect.bisect_left(range(len(ids)), cursor,
+                                     key=lambda k: (rank(posts[ids[k]], user_id, interactions), ids[k]))
+        for k in range(end - 1, -1, -1):
+            yield rank(posts[ids[k]], user_id, interactions), ids[k]
+
+    def generate_feed(self, user_id: int, limit: int = 20,
+                      cursor: Optional[FeedCursor] = None) -> List[dict]:
         """
-        pass
+        The next limit posts of user_id's feed, highest ranked first.
+        - Sources: the cached timeline (rebuilt on a miss) and the post list of each
+          followed celebrity, each already in rank order
+        - heapq.merge pulls from them lazily, so a page costs O(limit log k) for k sources
+          beyond locating the cursor in each
+        - The first page fixes which followees are celebrities and their affinity for the
+          whole paging session (see FeedCursor); timeline entries by those authors are
+          skipped, so a post reached through two sources is returned once
+        - Posts from blocked authors are skipped
+        - Each item carries a FeedCursor; pass the last one to get the following page.
+          A custom ranking must itself stay fixed while a feed is paged
+        """
+        storage = self.storage
+        following = storage.following.get(user_id, ())
+        if cursor is None:
+            celebrities = tuple((author_id, storage.interactions.get((user_id, author_id), 0))
+                                for author_id in following if self.is_celebrity(author_id))
+            position = None
+        else:
+            # A celebrity unfollowed mid-session drops out; one followed mid-session waits for page 1
+            celebrities = tuple(entry for entry in cursor.celebrities if entry[0] in following)
+            position = (cursor.score, cursor.post_id)
+        posts = storage.posts
+        celebrity_ids = {author_id for author_id, _ in celebrities}
+        sources = [((score, post_id) for score, post_id in self._timeline(user_id).newest(position)
+                    if posts[post_id]['author_id'] not in celebrity_ids)]
+        for author_id, interactions in celebrities:
+            sources.append(self._author_posts(author_id, user_id, interactions, position))
+        blocked = storage.blocked.get(user_id, ())
+        feed: List[dict] = []
+        seen = set()
+        for score, post_id in heapq.merge(*sources, reverse=True):
+            if post_id in seen:
+                continue
+            seen.add(post_id)
+            post = posts[post_id]
+            if post['author_id'] in blocked:
+                continue
+            feed.append(dict(post, score=score, cursor=FeedCursor(score, post_id, celebrities)))
+            if len(feed) == limit:
+                break
+        return feed
 
     def handle_post_interaction(self, post_id: int, user_id: int, action: str):
         """
-        Design the interaction handling system.
-        Consider:
-        - Real-time updates
-        - Consistency requirements
-        - Analytics tracking
-        - Notification dispatch
+        Records a 'like', 'unlike', 'share' or 'comment' by user_id on post_id.
+        - While an InteractionPipeline is running, the interaction is queued and
+          coalesced into the pipeline's next batch; asyncio.QueueFull is raised
+          when the queue is full (async producers await pipeline.submit instead)
+        - Otherwise it is written through at once: one storage write and one
+          notification publish per call
+        Repeated likes and shares by the same user count once; an unlike only
+        undoes an existing like.
+        """
+        self._check_interaction(post_id, action)
+        if self.interaction_pipeline is not None:
+            self.interaction_pipeline.submit_nowait(post_id, user_id, action)
+            return
+        window = InteractionWindow()
+        window.add(post_id, user_id, action)
+        self.write_interactions(window)
+
+    def _check_interaction(self, post_id: int, action: str) -> None:
+        if action not in INTERACTION_ACTIONS:
+            raise ValueError(f"action must be one of {INTERACTION_ACTIONS}")
+        if post_id not in self.storage.posts:
+            raise KeyError(f"Unknown post: {post_id}")
+
+    def write_interactions(self, window: 'InteractionWindow') -> int:
+        """
+        Applies a window of interactions as one storage write and publishes its
+        notifications in one call, one per (post, action) rather than per
+        interaction. Interactions also raise the user's affinity with the author,
+        which the default ranking reads. Returns the number of notifications.
         """
-        pass
+        notifications = self._store_interactions(window)
+        self._publish_notifications(notifications)
+        return len(notifications)
+
+    def _store_interactions(self, window: 'InteractionWindow') -> List[dict]:
+        """
+        The storage half of write_interactions; returns the grouped notifications.
+        Changes are worked out first and applied only once commit succeeds, so a
+        failed write leaves the store untouched and the window can be retried.
+        """
+        storage = self.storage
+        posts, affinity = storage.posts, storage.interactions
+        like_changes = [(post_id, user_id, liked) for (post_id, user_id), liked in window.likes.items()
+                        if liked != (user_id in storage.likes.get(post_id, ()))]
+        new_shares = [(post_id, user_id) for post_id, user_id in window.shares
+                      if user_id not in storage.shares.get(post_id, ())]
+        storage.commit()
+
+        notices: Dict[Tuple[int, str], List[int]] = {}
+
+        def count(post_id: int, user_id: int, field: str, delta: int) -> None:
+            stats = storage.post_stats.setdefault(post_id, {'likes': 0, 'shares': 0, 'comments': 0})
+            stats[field] += delta
+            if delta > 0:
+                author_id = posts[post_id]['author_id']
+                key = (user_id, author_id)
+                affinity[key] = affinity.get(key, 0) + 1
+                if author_id != user_id:
+                    notices.setdefault((post_id, field), []).append(user_id)
+
+        for post_id, user_id, liked in like_changes:
+            likers = storage.likes.setdefault(post_id, set())
+            (likers.add if liked else likers.discard)(user_id)
+            count(post_id, user_id, 'likes', 1 if liked else -1)
+        for post_id, user_id in new_shares:
+            storage.shares.setdefault(post_id, set()).add(user_id)
+            count(post_id, user_id, 'shares', 1)
+        for post_id, user_id in window.comments:
+            count(post_id, user_id, 'comments', 1)
+        return [
+            {'user_id': posts[post_id]['author_id'], 'post_id': post_id, 'action': field,
+             'actors': users[:NOTIFICATION_ACTORS], 'count': len(users)}
+            for (post_id, field), users in notices.items()
+        ]
+
+    def _publish_notifications(self, notifications: List[dict]) -> None:
+        if notifications:
+            self.message_queue.publish_many('notifications', notifications)
+
+
+# Interaction ingestion
+INTERACTION_ACTIONS = ('like', 'unlike', 'share', 'comment')
+# Actors named in a grouped notification ("a, b, c and 41 others liked your post")
+NOTIFICATION_ACTORS = 3
+
+
+class InteractionWindow:
+    """
+    Interactions collected for one flush, already coalesced.
+    - likes: (post_id, user_id) -> final like state; like/unlike toggles within the window cancel out
+    - shares: (post_id, user_id) pairs, so repeated shares collapse
+    - comments: (post_id, user_id) per comment; every comment counts
+    """
+    __slots__ = ('likes', 'shares', 'comments', 'size', 'opened')
+
+    def __init__(self):
+        self.likes: Dict[Tuple[int, int], bool] = {}
+        self.shares: set = set()
+        self.comments: List[Tuple[int, int]] = []
+        self.size = 0
+        self.opened = time.perf_counter()
+
+    def add(self, post_id: int, user_id: int, action: str) -> None:
+        if action == 'like' or action == 'unlike':
+            self.likes[(post_id, user_id)] = action == 'like'
+        elif action == 'share':
+            self.shares.add((post_id, user_id))
+        else:
+            self.comments.append((post_id, user_id))
+        self.size += 1
+
+
+class InteractionPipeline:
+    """
+    Asynchronous write-coalescing ingestion in front of SocialPlatform.write_interactions.
+    - submit puts an interaction on a bounded asyncio.Queue and waits while it is full,
+      which pushes back on producers instead of letting the backlog grow
+    - one consumer task folds queued interactions into an InteractionWindow, closed after
+      max_batch interactions or max_delay seconds from its first one
+    - a closed window is written in a worker thread while the next one fills; at most one
+      write is in flight, so a slow store slows the consumer and the queue fills up
+    - flush_latencies records, per window, seconds from its first interaction to the end
+      of its write
+    - a failed storage write or publish is retried up to max_retries times, backing off
+      from retry_delay seconds; after that the window goes to failed as (window, error),
+      with nothing of it stored, or its notifications to unpublished. Either way the
+      consumer keeps running
+    """
+    def __init__(self, platform: SocialPlatform, max_batch: int = 10_000, max_delay: float = 0.05,
+                 queue_size: int = 100_000, max_retries: int = 3, retry_delay: float = 0.01):
+        self.platform = platform
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue_size = queue_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.flush_latencies: List[float] = []
+        self.failed: List[Tuple[InteractionWindow, Exception]] = []
+        self.unpublished: List[dict] = []
+        self.interactions = 0
+        self.notifications = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+
+    async def start(self) -> 'InteractionPipeline':
+        if self.platform.interaction_pipeline is not None:
+            raise RuntimeError("The platform already has a running interaction pipeline")
+        self._queue = asyncio.Queue(self.queue_size)
+        self._consumer = asyncio.create_task(self._consume())
+        self.platform.interaction_pipeline = self
+        return self
+
+    async def submit(self, post_id: int, user_id: int, action: str) -> None:
+        self.platform._check_interaction(post_id, action)
+        await self._queue.put((post_id, user_id, action))
+
+    def submit_nowait(self, post_id: int, user_id: int, action: str) -> None:
+        self._queue.put_nowait((post_id, user_id, action))
+
+    async def stop(self) -> None:
+        """Stops accepting interactions, then flushes everything queued before returning"""
+        self.platform.interaction_pipeline = None
+        await self._queue.put(None)
+        await self._consumer
+
+    async def _consume(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        flushing: Optional[asyncio.Future] = None
+        window: Optional[InteractionWindow] = None
+        stopping = False
+        while not stopping:
+            if window is None:
+                item = await queue.get()
+                if item is None:
+                    break
+                window = InteractionWindow()
+                window.add(*item)
+            # Take whatever is already queued without yielding to the event loop
+            while window.size < self.max_batch:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                window.add(*item)
+            remaining = window.opened + self.max_delay - time.perf_counter()
+            if window.size < self.max_batch and not stopping and remaining > 0:
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    if item is None:
+                        stopping = True
+                    else:
+                        window.add(*item)
+                    continue
+            if flushing is not None:
+                await flushing
+            flushing = loop.run_in_executor(None, self._flush, window)
+            window = None
+        if window is not None:
+            if flushing is not None:
+                await flushing
+            flushing = loop.run_in_executor(None, self._flush, window)
+        if flushing is not None:
+            await flushing
+
+    def _flush(self, window: InteractionWindow) -> None:
+        # Runs in a worker thread, so errors are caught here rather than surfacing at
+        # the next await and stopping the consumer
+        try:
+            notifications = self._retry(self.platform._store_interactions, window)
+        except Exception as error:
+            self.failed.append((window, error))
+            return
+        self.interactions += window.size
+        self.flush_latencies.append(time.perf_counter() - window.opened)
+        try:
+            self._retry(self.platform._publish_notifications, notifications)
+        except Exception:
+            self.unpublished.extend(notifications)
+        else:
+            self.notifications += len(notifications)
+
+    def _retry(self, write: Callable[[Any], Any], argument: Any) -> Any:
+        for attempt in range(self.max_retries):
+            try:
+                return write(argument)
+            except Exception:
+                time.sleep(self.retry_delay * 2 ** attempt)
+        return write(argument)
+
+
+def _percentile(samples: List[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+def check_feed_paging() -> None:
+    """
+    Pages whole feeds while the ranking inputs change between pages: a like that
+    raises a celebrity's affinity, and an author crossing celebrity_threshold both
+    before and during paging. Every post must come back exactly once, in the order
+    of the cursors. Raises AssertionError otherwise.
+    """
+    def page_through(platform: SocialPlatform, user_id: int, limit: int,
+                     between_pages: Callable[[], None]) -> List[int]:
+        seen, cursor = [], None
+        while True:
+            page = platform.generate_feed(user_id, limit, cursor)
+            if not page:
+                return seen
+            seen.extend(item['post_id'] for item in page)
+            if cursor is not None and (page[0]['score'], page[0]['post_id']) >= cursor[:2]:
+                raise AssertionError(f"page starts above its cursor: {page[0]['post_id']}")
+            cursor = page[-1]['cursor']
+            between_pages()
+
+    def expect_each_once(label: str, got: List[int], expected: Iterable[int]) -> None:
+        if sorted(got) != sorted(expected):
+            raise AssertionError(f"{label}: paged {got}, expected each of {sorted(expected)} once")
+
+    # User 0 follows celebrity 1 and ordinary user 3; the like lands after page one
+    platform = SocialPlatform(celebrity_threshold=2)
+    platform.follow(0, 1)
+    platform.follow(0, 3)
+    platform.follow(9, 1)
+    for i in range(20):
+        platform.create_post(1 if i % 2 == 0 else 3, f"post {i}", float(i))
+    platform.generate_feed(0)
+    platform.process_fanout()
+    likes = iter([lambda: platform.handle_post_interaction(1, 0, 'like')])
+    got = page_through(platform, 0, 4, lambda: next(likes, lambda: None)())
+    expect_each_once("like between pages", got, platform.storage.posts)
+
+    # Author 1's posts are fanned out to user 0, then author 1 becomes a celebrity,
+    # before paging and then again in the middle of it
+    for crossing_page in (0, 2):
+        platform = SocialPlatform(celebrity_threshold=3)
+        platform.follow(0, 1)
+        platform.generate_feed(0)
+        for i in range(6):
+            platform.create_post(1, f"post {i}", float(i))
+        platform.process_fanout()
+        pages = itertools.count(1)
+
+        def promote() -> None:
+            if next(pages) == crossing_page:
+                platform.follow(7, 1)
+                platform.follow(8, 1)
+
+        if crossing_page == 0:
+            platform.follow(7, 1)
+            platform.follow(8, 1)
+        got = page_through(platform, 0, 2, promote)
+        expect_each_once(f"celebrity threshold crossed at page {crossing_page}", got, platform.storage.posts)
+    print("check_feed_paging: OK")
+
+
+def benchmark_feed(users: int = 1_000_000, follows_per_user: int = 10, posts: int = 1_000_000,
+                   active_users: int = 20_000, requests: int = 20_000, seed: int = 0) -> Dict[str, float]:
+    """
+    Simulates users accounts following skewed followees (a few reach celebrity size),
+    warms the timelines of active_users, publishes posts through the fan-out queue and
+    reports p50/p99 generate_feed latency for first pages, cursor pages and cold rebuilds
+    """
+    rng = random.Random(seed)
+    platform = SocialPlatform()
+    storage = platform.storage
+    started = time.perf_counter()
+    # Followee ids are skewed towards 0: id < users / 1000 gets about 10% of all follows
+    for follower_id in range(users):
+        following = array('q', {int(users * rng.random() ** 3) for _ in range(follows_per_user)} - {follower_id})
+        storage.following[follower_id] = following
+        for followee_id in following:
+            storage.followers.setdefault(followee_id, array('q')).append(follower_id)
+    celebrities = sum(platform.is_celebrity(user_id) for user_id in storage.followers)
+    print(f"{users:,} users, {sum(map(len, storage.following.values())):,} follows, "
+          f"{celebrities} celebrities, built in {time.perf_counter() - started:.1f}s")
+
+    def timed(run, *args, **kwargs) -> Tuple[Any, float]:
+        started = time.perf_counter()
+        result = run(*args, **kwargs)
+        return result, time.perf_counter() - started
+
+    active = rng.sample(range(users), active_users)
+    created_at = 1_700_000_000.0
+    for i in range(posts // 2):
+        platform.create_post(int(users * rng.random() ** 2), f"post {i}", created_at + i)
+    cold = [timed(platform.generate_feed, user_id)[1] for user_id in active]
+
+    fanout_seconds, written = 0.0, 0
+    for i in range(posts // 2, posts):
+        platform.create_post(int(users * rng.random() ** 2), f"post {i}", created_at + i)
+        if not i % 1000:
+            count, seconds = timed(platform.process_fanout)
+            fanout_seconds += seconds
+            written += count
+    count, seconds = timed(platform.process_fanout)
+    fanout_seconds += seconds
+    written += count
+
+    first, following = [], []
+    returned = 0
+    for _ in range(requests):
+        user_id = rng.choice(active)
+        page, seconds = timed(platform.generate_feed, user_id)
+        first.append(seconds)
+        returned += len(page)
+        if page:
+            following.append(timed(platform.generate_feed, user_id, cursor=page[-1]['cursor'])[1])
+    result = {
+        'cold_p50_ms': 1000 * _percentile(cold, 0.5),
+        'cold_p99_ms': 1000 * _percentile(cold, 0.99),
+        'feed_p50_ms': 1000 * _percentile(first, 0.5),
+        'feed_p99_ms': 1000 * _percentile(first, 0.99),
+        'cursor_p50_ms': 1000 * _percentile(following, 0.5),
+        'cursor_p99_ms': 1000 * _percentile(following, 0.99),
+        'fanout_writes_per_s': written / max(fanout_seconds, 1e-9),
+        'mean_page': returned / max(1, requests),
+    }
+    print(f"fan-out: {written:,} timeline writes at {result['fanout_writes_per_s']:,.0f}/s, "
+          f"mean first page {result['mean_page']:.1f} posts")
+    for label, key in (('cold rebuild', 'cold'), ('cached feed', 'feed'), ('cursor page', 'cursor')):
+        print(f"{label:>13}: p50 {result[key + '_p50_ms']:.3f}ms, p99 {result[key + '_p99_ms']:.3f}ms")
+    return result
+
+
+def benchmark_interactions(interactions: int = 200_000, posts: int = 1000, users: int = 100_000,
+                           producers: int = 8, write_latency: float = 0.0005, per_call: int = 2000,
+                           seed: int = 0) -> Dict[str, float]:
+    """
+    Viral interaction load (a few posts take most of it) against a store and broker
+    that spend write_latency per round trip: handle_post_interaction written through
+    per call (on the first per_call interactions) against an InteractionPipeline fed
+    by concurrent producers; reports sustained interactions/s, storage writes and the
+    pipeline's p50/p99 flush latency. Final counters are checked against write-through.
+    """
+    rng = random.Random(seed)
+    events = [(1 + int(posts * rng.random() ** 4), rng.randrange(users),
+               rng.choices(INTERACTION_ACTIONS, (70, 5, 10, 15))[0]) for _ in range(interactions)]
+
+    def platform_with_posts(latency: float) -> SocialPlatform:
+        platform = SocialPlatform()
+        platform.storage.write_latency = platform.message_queue.publish_latency = latency
+        for i in range(posts):
+            platform.create_post(rng.randrange(users), f"post {i}", float(i))
+        return platform
+
+    direct = platform_with_posts(write_latency)
+    started = time.perf_counter()
+    for event in events[:per_call]:
+        direct.handle_post_interaction(*event)
+    direct_rate = per_call / (time.perf_counter() - started)
+
+    batched = platform_with_posts(write_latency)
+
+    async def run() -> InteractionPipeline:
+        pipeline = await InteractionPipeline(batched).start()
+
+        async def produce(k: int) -> None:
+            # A user's interactions stay on one producer, so their order is kept
+            for event in events:
+                if event[1] % producers == k:
+                    await pipeline.submit(*event)
+
+        await asyncio.gather(*(produce(k) for k in range(producers)))
+        await pipeline.stop()
+        return pipeline
+
+    started = time.perf_counter()
+    pipeline = asyncio.run(run())
+    pipeline_rate = interactions / (time.perf_counter() - started)
+
+    reference = platform_with_posts(0.0)
+    for event in events:
+        reference.handle_post_interaction(*event)
+    assert batched.storage.post_stats == reference.storage.post_stats
+
+    result = {
+        'per_call_per_s': direct_rate,
+        'pipeline_per_s': pipeline_rate,
+        'pipeline_writes': batched.storage.writes,
+        'flush_p50_ms': 1000 * _percentile(pipeline.flush_latencies, 0.5),
+        'flush_p99_ms': 1000 * _percentile(pipeline.flush_latencies, 0.99),
+    }
+    print(f"per call: {direct_rate:,.0f} interactions/s, one write per interaction")
+    print(f"pipeline: {pipeline_rate:,.0f} interactions/s, {interactions:,} interactions in "
+          f"{result['pipeline_writes']:,} writes, flush latency p50 {result['flush_p50_ms']:.1f}ms "
+          f"p99 {result['flush_p99_ms']:.1f}ms")
+    return result
 
 # Challenge 3: Real-time Chat System
 """
@@ -159,31 +905,251 @@ Design and implement:
 4. Encryption approach
 """
 
+# Chat delivery engine
+class MemoryTransport:
+    """
+    In-process transport for tests and load generation: each write appends
+    (receive time, frames) to received. delay seconds per write simulate a slow client.
+    """
+    def __init__(self, delay: float = 0.0):
+        self.received: List[Tuple[float, List[bytes]]] = []
+        self.delay = delay
+        self.closed = False
+
+    async def write(self, frames: List[bytes]) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append((time.time(), frames))
+
+    def write_nowait(self, frame: bytes) -> bool:
+        if self.delay:
+            return False
+        self.received.append((time.time(), [frame]))
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class StreamTransport:
+    """
+    Transport over an asyncio stream (TCP or Unix socket): one writelines and drain per
+    batch. write_nowait hands a frame straight to the socket while less than high_water
+    bytes are waiting in its buffer.
+    """
+    def __init__(self, writer: asyncio.StreamWriter, high_water: int = 64 * 1024):
+        self.writer = writer
+        self.high_water = high_water
+
+    async def write(self, frames: List[bytes]) -> None:
+        self.writer.writelines(frames)
+        await self.writer.drain()
+
+    def write_nowait(self, frame: bytes) -> bool:
+        writer = self.writer
+        if writer.is_closing() or writer.transport.get_write_buffer_size() >= self.high_water:
+            return False
+        writer.write(frame)
+        return True
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class MessageLog:
+    """
+    Append-only per-user log of frames that could not be delivered live.
+    - entry n (from 1) of a user's log has sequence number n
+    - acked[user_id] is the last sequence number written to one of the user's connections
+    """
+    def __init__(self):
+        self._entries: Dict[int, List[bytes]] = {}
+        self.acked: Dict[int, int] = {}
+
+    def append(self, user_id: int, frame: bytes) -> int:
+        entries = self._entries.setdefault(user_id, [])
+        entries.append(frame)
+        return len(entries)
+
+    def read(self, user_id: int, after: int = 0) -> List[Tuple[int, bytes]]:
+        entries = self._entries.get(user_id, [])
+        return list(zip(range(after + 1, len(entries) + 1), entries[after:]))
+
+    def ack(self, user_id: int, seq: int) -> None:
+        self.acked[user_id] = max(self.acked.get(user_id, 0), seq)
+
+
+class ChatConnection:
+    """
+    One device of a user: a bounded send buffer drained by its own writer task.
+    - offer never waits. A full buffer (queue_size frames) marks a slow consumer and
+      offer returns False, so one slow client cannot hold up a group fan-out
+    - with nothing buffered or in flight, a frame the transport accepts without
+      blocking (write_nowait) is written at once, saving a writer task wake-up per
+      recipient of a large group
+    - otherwise the writer sends everything buffered, up to max_batch frames, in one
+      transport write
+    """
+    def __init__(self, chat: 'ChatSystem', user_id: int, transport: Any, queue_size: int, max_batch: int):
+        self.chat = chat
+        self.user_id = user_id
+        self.transport = transport
+        self.queue_size = queue_size
+        self.max_batch = max_batch
+        self.buffer: deque = deque()
+        self.in_flight: List[bytes] = []
+        self.sent = 0
+        # Set only while the writer waits on an empty buffer; cheaper than an asyncio.Event
+        self._waiter: Optional[asyncio.Future] = None
+        self._write_nowait = getattr(transport, 'write_nowait', None)
+        self._task = asyncio.create_task(self._write_loop())
+
+    def offer(self, frame: bytes) -> bool:
+        if not self.buffer and not self.in_flight and self._write_nowait is not None \
+                and self._write_nowait(frame):
+            self.sent += 1
+            return True
+        if len(self.buffer) >= self.queue_size:
+            return False
+        self.buffer.append(frame)
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+        return True
+
+    def idle(self) -> bool:
+        return not self.buffer and not self.in_flight
+
+    async def _write_loop(self) -> None:
+        buffer = self.buffer
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if not buffer:
+                    self._waiter = loop.create_future()
+                    await self._waiter
+                self.in_flight = [buffer.popleft() for _ in range(min(self.max_batch, len(buffer)))]
+                await self.transport.write(self.in_flight)
+                self.sent += len(self.in_flight)
+                self.in_flight = []
+        except (ConnectionError, OSError):
+            self.chat._detach(self)
+
+    def abort(self) -> List[bytes]:
+        """Stops the writer and closes the transport; returns the frames not known to be sent"""
+        self._task.cancel()
+        unsent = self.in_flight + list(self.buffer)
+        self.in_flight = []
+        self.buffer.clear()
+        self.transport.close()
+        return unsent
+
+
 # Example implementation structure
 class ChatSystem:
     """
-    Design the chat system architecture.
-    Consider:
-    - WebSocket management
-    - Message queuing
-    - Storage partitioning
-    - Encryption handling
+    asyncio delivery engine.
+    - connections: user_id -> ChatConnection per connected device, each with its own
+      bounded buffer and writer task
+    - handle_message encodes a message once and offers the same frame to every
+      recipient connection without awaiting, yielding to the event loop every
+      FANOUT_SLICE recipients so a 10k-member group does not stall other deliveries
+    - a connection whose buffer is full is disconnected; its unsent frames and later
+      messages go to the user's MessageLog (storage), replayed with sequence numbers
+      on the next connect. Delivery is at least once: frames of an interrupted write
+      are logged again, and clients drop repeats by message id
+    - groups: group_id -> member ids; a recipient_id registered with create_group
+      is a group
     """
-    def __init__(self):
-        self.connections = {}
+    FANOUT_SLICE = 1024
+
+    def __init__(self, queue_size: int = 1024, max_batch: int = 256):
+        self.connections: Dict[int, List[ChatConnection]] = {}
         self.message_queue = None
-        self.storage = None
+        self.storage = MessageLog()
+        self.groups: Dict[int, List[int]] = {}
+        self.queue_size = queue_size
+        self.max_batch = max_batch
+        self.slow_disconnects = 0
+        self._message_ids = itertools.count(1)
+
+    def create_group(self, group_id: int, members: Iterable[int]) -> None:
+        self.groups[group_id] = list(dict.fromkeys(members))
 
-    async def handle_message(self, sender_id: int, recipient_id: int, content: dict):
+    async def connect(self, user_id: int, transport: Any, after_seq: Optional[int] = None) -> ChatConnection:
         """
-        Design the message handling system.
-        Consider:
-        - Delivery guarantees
-        - Offline handling
-        - Media processing
-        - Error recovery
+        Attaches a device. Logged frames after after_seq (default: the last one written
+        to any of the user's devices) are sent first, as {"seq": n, "message": ...}
+        lines, then live delivery starts.
         """
-        pass
+        after = self.storage.acked.get(user_id, 0) if after_seq is None else after_seq
+        # Messages logged while replaying are picked up by the next read; the last read
+        # and the registration below run without an await between them
+        while True:
+            entries = self.storage.read(user_id, after)
+            if not entries:
+                break
+            for start in range(0, len(entries), self.max_batch):
+                chunk = entries[start:start + self.max_batch]
+                await transport.write([b'{"seq": %d, "message": %s}\n' % (seq, frame[:-1]) for seq, frame in chunk])
+                after = chunk[-1][0]
+                self.storage.ack(user_id, after)
+        connection = ChatConnection(self, user_id, transport, self.queue_size, self.max_batch)
+        self.connections.setdefault(user_id, []).append(connection)
+        return connection
+
+    def disconnect(self, connection: ChatConnection) -> None:
+        self._detach(connection)
+
+    def _detach(self, connection: ChatConnection) -> None:
+        devices = self.connections.get(connection.user_id, [])
+        if connection not in devices:
+            return
+        devices.remove(connection)
+        if not devices:
+            del self.connections[connection.user_id]
+        # Other devices may have connected after these were queued: keep them for the next connect
+        for frame in connection.abort():
+            self.storage.append(connection.user_id, frame)
+
+    def close(self) -> None:
+        """Disconnects every device, logging what was still unsent"""
+        for devices in list(self.connections.values()):
+            for connection in list(devices):
+                self._detach(connection)
+
+    async def handle_message(self, sender_id: int, recipient_id: int, content: dict) -> Dict[str, int]:
+        """
+        Delivers content to recipient_id (a user or a group). Returns counts of frames
+        queued on connections, frames logged for offline users and slow connections
+        dropped. The frame carries the sender's wall-clock send time for latency checks.
+        """
+        members = self.groups.get(recipient_id)
+        message = {'id': next(self._message_ids), 'from': sender_id, 'to': recipient_id,
+                   'content': content, 'sent': time.time()}
+        if members is not None:
+            message['group'] = True
+        frame = json.dumps(message).encode() + b'\n'
+        recipients = [member for member in members if member != sender_id] if members is not None else [recipient_id]
+        queued = logged = dropped = 0
+        for index, user_id in enumerate(recipients):
+            devices = self.connections.get(user_id)
+            if devices:
+                for connection in list(devices):
+                    if connection.offer(frame):
+                        queued += 1
+                    else:
+                        self.slow_disconnects += 1
+                        dropped += 1
+                        self._detach(connection)
+            if user_id not in self.connections:
+                self.storage.append(user_id, frame)
+                logged += 1
+            if index % self.FANOUT_SLICE == self.FANOUT_SLICE - 1:
+                await asyncio.sleep(0)
+        return {'queued': queued, 'logged': logged, 'dropped': dropped}
 
     def manage_presence(self, user_id: int, status: str):
         """
@@ -194,4 +1160,122 @@ class ChatSystem:
         - Privacy controls
         - Performance optimization
         """
-        pass 
\ No newline at end of file
+        pass 
+
+
+def benchmark_chat(users: int = 20_000, group_size: int = 10_000, direct_messages: int = 50_000,
+                   group_messages: int = 20, rate: float = 20_000.0, offline_share: float = 0.1,
+                   slow_share: float = 0.01, slow_delay: float = 0.05, transport: str = 'memory',
+                   seed: int = 0) -> Dict[str, float]:
+    """
+    Load generator for ChatSystem: users connect over MemoryTransport (or loopback TCP
+    with transport='socket'; keep users to a few hundred there), offline_share stay
+    offline and slow_share read slowly. Direct messages between random users are sent
+    open loop at rate per second, with group_messages spread among them to a group of
+    the first group_size users. Reports p50/p99 delivery latency of direct and group
+    messages on the other connections, frames logged and slow consumers dropped.
+    """
+    return asyncio.run(_chat_load(users, group_size, direct_messages, group_messages, rate,
+                                  offline_share, slow_share, slow_delay, transport, seed))
+
+
+async def _chat_load(users, group_size, direct_messages, group_messages, rate, offline_share,
+                     slow_share, slow_delay, transport, seed) -> Dict[str, float]:
+    rng = random.Random(seed)
+    chat = ChatSystem()
+    # (slow, [(receive time, frames)]) per connected user
+    sinks: List[Tuple[bool, List[Tuple[float, List[bytes]]]]] = []
+    readers: List[asyncio.Task] = []
+    # Client writers must stay referenced: a collected StreamWriter closes its socket
+    clients: List[asyncio.StreamWriter] = []
+    server = None
+    if transport == 'socket':
+        async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await chat.connect(int(await reader.readline()), StreamTransport(writer))
+
+        async def read(reader: asyncio.StreamReader, received: List, delay: float) -> None:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                received.append((time.time(), [line]))
+                if delay:
+                    await asyncio.sleep(delay)
+
+        server = await asyncio.start_server(accept, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+    elif transport != 'memory':
+        raise ValueError("transport must be 'memory' or 'socket'")
+
+    for user_id in range(users):
+        if rng.random() < offline_share:
+            continue
+        slow = rng.random() < slow_share
+        delay = slow_delay if slow else 0.0
+        if server is None:
+            sink = MemoryTransport(delay)
+            await chat.connect(user_id, sink)
+            sinks.append((slow, sink.received))
+        else:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'%d\n' % user_id)
+            clients.append(writer)
+            received: List = []
+            readers.append(asyncio.create_task(read(reader, received, delay)))
+            sinks.append((slow, received))
+    if server is not None:
+        while sum(map(len, chat.connections.values())) < len(sinks):
+            await asyncio.sleep(0.01)
+    group_id = -1
+    chat.create_group(group_id, range(group_size))
+
+    every = max(1, direct_messages // max(1, group_messages))
+    started = time.perf_counter()
+    for i in range(direct_messages):
+        ahead = started + i / rate - time.perf_counter()
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+        await chat.handle_message(rng.randrange(users), rng.randrange(users), {'text': 'hello'})
+        if i % every == every // 2:
+            await chat.handle_message(rng.randrange(group_size), group_id, {'text': 'hello all'})
+    # Let the writers and readers drain
+    for _ in range(1000):
+        if all(connection.idle() for devices in chat.connections.values() for connection in devices):
+            break
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.1 if server is not None else 0)
+
+    latencies: Dict[bool, List[float]] = {False: [], True: []}
+    for slow, received in sinks:
+        if slow:
+            continue
+        for received_at, frames in received:
+            for frame in frames:
+                message = json.loads(frame)
+                latencies['group' in message].append(received_at - message['sent'])
+    logged = sum(len(chat.storage.read(user_id)) for user_id in range(users))
+    chat.close()
+    for task in readers:
+        task.cancel()
+    for writer in clients:
+        writer.close()
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+    result = {
+        'direct_p50_ms': 1000 * _percentile(latencies[False], 0.5),
+        'direct_p99_ms': 1000 * _percentile(latencies[False], 0.99),
+        'group_p50_ms': 1000 * _percentile(latencies[True], 0.5),
+        'group_p99_ms': 1000 * _percentile(latencies[True], 0.99),
+        'delivered': len(latencies[False]) + len(latencies[True]),
+        'logged': logged,
+        'slow_disconnects': chat.slow_disconnects,
+    }
+    print(f"{transport}: {len(sinks):,} connected of {users:,}, group of {group_size:,}, "
+          f"{direct_messages:,} direct at {rate:,.0f}/s + {group_messages} group messages")
+    print(f"  direct p50 {result['direct_p50_ms']:.2f}ms p99 {result['direct_p99_ms']:.2f}ms, "
+          f"group p50 {result['group_p50_ms']:.2f}ms p99 {result['group_p99_ms']:.2f}ms; "
+          f"{result['delivered']:,} frames delivered, {logged:,} logged, "
+          f"{result['slow_disconnects']} slow consumers dropped")
+    return result